@@ -4,9 +4,15 @@ from abc import abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
+from typing import ClassVar
 from typing import Mapping
+from typing import MutableMapping
+from typing import Optional
+from typing import Sequence
 from typing import final
 
+from botix.tools import DirectorySnapshot
+
 
 @dataclass(frozen=True)
 class Loader[T](ABC):
@@ -14,6 +20,10 @@ class Loader[T](ABC):
 
     _path: Path
     """Рабочий путь"""
+    _snapshot: Optional[DirectorySnapshot] = None
+    """Снимок дерева каталогов (None - обращения к файловой системе)"""
+    _cache: Optional[MutableMapping[Path, Any]] = None
+    """Загруженные сущности по пути в пределах одной загрузки проекта (None - без кэширования)"""
 
     @abstractmethod
     def load(self) -> T:
@@ -39,7 +49,12 @@ class AttributesLoader[T](Loader[T], ABC):
     @final
     def exists(self) -> bool:
         """Каталог содержит атрибут"""
-        return self._getFilePath().exists()
+        path = self._getFilePath()
+
+        if self._snapshot is not None and self._snapshot.covers(path.parent):
+            return self._snapshot.isFile(path)
+
+        return path.exists()
 
     def _getFilePath(self) -> Path:
         return self._path / f".{self.getSuffix()}"
@@ -47,6 +62,9 @@ class AttributesLoader[T](Loader[T], ABC):
 
 class EntityLoader[T](Loader[T], ABC):
 
+    ignored_folders: ClassVar[Sequence[str]] = (".*",)
+    """Шаблоны имён каталогов, пропускаемых при обходе (скрытые каталоги: .git, .idea, ...)"""
+
     def name(self) -> str:
         """Имя сущности"""
         return self._path.stem
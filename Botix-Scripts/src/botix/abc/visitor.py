@@ -29,10 +29,74 @@ class EntityVisitor(ABC):
     def visitProjectEntity(self, project) -> None:
         """Посетить сущность проекта"""
 
+    def beginUnitsSection(self, attributes) -> None:
+        """Поток загрузки: начат раздел сборочных единиц (далее следуют его сборочные единицы)"""
+
+    def endUnitsSection(self, units_section) -> None:
+        """Поток загрузки: раздел сборочных единиц загружен"""
+
+    def beginPartsSection(self, attributes) -> None:
+        """Поток загрузки: начат раздел общих деталей (далее следуют его детали)"""
+
+    def endPartsSection(self, parts_section) -> None:
+        """Поток загрузки: раздел общих деталей загружен"""
+
 
 class Visitable(ABC):
     """Посещаемый"""
 
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor: EntityVisitor) -> None:
         """Принять посетителя"""
+
+
+class TraversalVisitor(EntityVisitor, ABC):
+    """
+    Посетитель однократного обхода (TraversalEngine): вместо рекурсии получает отметки входа в узел и выхода из него.
+    Вход, вернувший False, исключает поддерево узла для данного посетителя.
+    Движок вызывает только переопределённые отметки
+    """
+
+    def enterProjectEntity(self, project) -> bool:
+        """Вход в проект (далее - разделы сборочных единиц, затем разделы общих деталей)"""
+        return True
+
+    def leaveProjectEntity(self, project) -> None:
+        """Выход из проекта"""
+
+    def enterUnitsSectionEntity(self, units_section) -> bool:
+        """Вход в раздел сборочных единиц (далее - сборочные единицы)"""
+        return True
+
+    def leaveUnitsSectionEntity(self, units_section) -> None:
+        """Выход из раздела сборочных единиц"""
+
+    def enterPartsSectionEntity(self, parts_section) -> bool:
+        """Вход в раздел общих деталей (далее - детали)"""
+        return True
+
+    def leavePartsSectionEntity(self, parts_section) -> None:
+        """Выход из раздела общих деталей"""
+
+    def enterUnitEntity(self, unit) -> bool:
+        """Вход в сборочную единицу (далее - её метаданные, затем детали)"""
+        return True
+
+    def leaveUnitEntity(self, unit) -> None:
+        """Выход из сборочной единицы"""
+
+    def enterPartEntity(self, part) -> bool:
+        """Вход в деталь (далее - её метаданные)"""
+        return True
+
+    def leavePartEntity(self, part) -> None:
+        """Выход из детали"""
+
+    def enterMetadataEntity(self, metadata) -> bool:
+        """Вход в метаданные"""
+        return True
+
+    def leaveMetadataEntity(self, metadata) -> None:
+        """Выход из метаданных"""
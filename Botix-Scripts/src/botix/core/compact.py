@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+from weakref import WeakValueDictionary
+
+
+class _SharedFolder(type(Path())):
+    """Общий объект каталога. Допускает слабые ссылки; производные пути - обычные Path"""
+
+    __slots__ = ("__weakref__",)
+
+    def with_segments(self, *path_segments) -> Path:
+        return Path(*path_segments)
+
+    def __reduce__(self):
+        # При чтении из pickle объект снова становится общим
+        return internFolder, (Path(self),)
+
+
+_folders = WeakValueDictionary[Path, _SharedFolder]()
+"""Общие объекты каталогов (удаляются вместе с последней ссылающейся сущностью)"""
+
+
+def internFolder(folder: Path) -> Path:
+    """Получить общий объект каталога"""
+    ret = _folders.get(folder)
+
+    if ret is None:
+        ret = _folders.setdefault(folder, _SharedFolder(folder))
+
+    return ret
+
+
+def internWords(words: Iterable[str]) -> tuple[str, ...]:
+    """
+    Получить кортеж ключевых слов из общих строк (sys.intern).
+    Сами кортежи не разделяются: на кортеж нельзя создать слабую ссылку, а постоянная таблица не освобождалась бы
+    """
+    return tuple(map(sys.intern, words))
+
+
+@dataclass(frozen=True, slots=True)
+class CompactPath:
+    """Путь к файлу в виде общего объекта каталога и имени. Path создаётся при обращении"""
+
+    folder: Path
+    """Каталог (общий объект)"""
+    name: str
+    """Имя файла"""
+
+    @classmethod
+    def of(cls, path: Path) -> CompactPath:
+        """Сжать путь"""
+        return cls(internFolder(path.parent), sys.intern(path.name))
+
+    def toPath(self) -> Path:
+        """Получить путь"""
+        return self.folder / self.name
+
+    def __reduce__(self):
+        # Общий объект каталога сохраняется в pickle один раз
+        return CompactPath, (self.folder, self.name)
+
+    def __repr__(self) -> str:
+        return repr(self.toPath())
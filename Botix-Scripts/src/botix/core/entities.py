@@ -11,9 +11,11 @@ from botix.abc.visitor import Visitable
 from botix.core.attributes import PartsSectionAttributes
 from botix.core.attributes import UnitAttributes
 from botix.core.attributes import UnitsSectionAttributes
+from botix.core.compact import CompactPath
+from botix.core.compact import internWords
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True, init=False)
 class MetadataEntity(Visitable):
     """Метаданные сущности"""
 
@@ -24,15 +26,31 @@ class MetadataEntity(Visitable):
     version_prefix: ClassVar = 'v'
     """Префикс версии"""
 
-    path: Path
+    _path: CompactPath
     """Путь"""
-    words: Sequence[str]
-    """Ключевые слова"""
+    words: tuple[str, ...]
+    """Ключевые слова (общие строки)"""
     version: int
     """Версия"""
-    images: Sequence[Path]
+    _images: tuple[CompactPath, ...]
     """Изображения"""
 
+    def __init__(self, *, path: Path, words: Sequence[str], version: int, images: Sequence[Path]) -> None:
+        object.__setattr__(self, "_path", CompactPath.of(path))
+        object.__setattr__(self, "words", internWords(words))
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "_images", tuple(map(CompactPath.of, images)))
+
+    @property
+    def path(self) -> Path:
+        """Путь"""
+        return self._path.toPath()
+
+    @property
+    def images(self) -> Sequence[Path]:
+        """Изображения"""
+        return tuple(image.toPath() for image in self._images)
+
     def getDisplayName(self) -> str:
         """Получить отображаемое имя"""
         return self.display_words_joiner.join(self.words)
@@ -43,44 +61,101 @@ class MetadataEntity(Visitable):
 
     def getEntityName(self) -> str:
         """Получить имя сущности"""
-        w = tuple(self.words) + (self.getDisplayVersion(),)
-        return f"{self.parse_words_delimiter.join(w)}"
+        return self.makeEntityName(self.words, self.version)
+
+    @classmethod
+    def parseName(cls, name: str) -> tuple[Sequence[str], Optional[int]]:
+        """Разобрать имя на ключевые слова и версию (None - версия не указана)"""
+        words = name.split(cls.parse_words_delimiter)
+        version_string = words[-1].lower()
+
+        if version_string.startswith(cls.version_prefix):
+            pure_version_string = version_string[slice(len(cls.version_prefix), None)]
+
+            if pure_version_string.isdecimal():
+                return words[:-1], int(pure_version_string)
+
+        return words, None
+
+    @classmethod
+    def makeEntityName(cls, words: Sequence[str], version: int) -> str:
+        """Составить имя сущности из ключевых слов и версии"""
+        w = tuple(words) + (f"{cls.version_prefix}{version}",)
+        return f"{cls.parse_words_delimiter.join(w)}"
 
     def accept(self, visitor: EntityVisitor) -> None:
         visitor.visitMetadataEntity(self)
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True, init=False)
 class PartEntity(Visitable):
     """Деталь"""
 
+    prusa_project_suffix: ClassVar = ".prusa.3mf"
+    """Суффикс файла проекта PrusaSlicer среди переходных форматов"""
+
     metadata: MetadataEntity
     """Метаданные данной детали"""
-    transitions: Sequence[Path]
+    _transitions: tuple[CompactPath, ...]
     """Пути к файлам переходных форматов данной детали"""
 
+    def __init__(self, *, metadata: MetadataEntity, transitions: Sequence[Path]) -> None:
+        object.__setattr__(self, "metadata", metadata)
+        object.__setattr__(self, "_transitions", tuple(map(CompactPath.of, transitions)))
+
+    @property
+    def transitions(self) -> Sequence[Path]:
+        """Пути к файлам переходных форматов данной детали"""
+        return tuple(transition.toPath() for transition in self._transitions)
+
+    def getPrusaProject(self) -> Optional[Path]:
+        """Получить путь к проекту PrusaSlicer"""
+        for transition in self._transitions:
+            if transition.name.endswith(self.prusa_project_suffix):
+                return transition.toPath()
+
+        return None
+
     def accept(self, visitor: EntityVisitor) -> None:
         visitor.visitPartEntity(self)
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True, init=False)
 class UnitEntity(Visitable):
     """Сборочная единица"""
 
     metadata: MetadataEntity
     """Метаданные сборочной единицы"""
-    transition_assembly: Optional[Path]
+    _transition_assembly: Optional[CompactPath]
     """Путь к файлу сборки в переходном формате"""
-    parts: Sequence[PartEntity]
+    parts: tuple[PartEntity, ...]
     """Входящие в состав детали"""
     attributes: Optional[UnitAttributes]
     """Атрибуты сборочной единицы"""
 
+    def __init__(
+            self,
+            *,
+            metadata: MetadataEntity,
+            transition_assembly: Optional[Path],
+            parts: Sequence[PartEntity],
+            attributes: Optional[UnitAttributes]
+    ) -> None:
+        object.__setattr__(self, "metadata", metadata)
+        object.__setattr__(self, "_transition_assembly", None if transition_assembly is None else CompactPath.of(transition_assembly))
+        object.__setattr__(self, "parts", tuple(parts))
+        object.__setattr__(self, "attributes", attributes)
+
+    @property
+    def transition_assembly(self) -> Optional[Path]:
+        """Путь к файлу сборки в переходном формате"""
+        return None if self._transition_assembly is None else self._transition_assembly.toPath()
+
     def accept(self, visitor: EntityVisitor) -> None:
         visitor.visitUnitEntity(self)
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class UnitsSectionEntity(Visitable):
     """Раздел сборочных единиц"""
 
@@ -93,7 +168,7 @@ class UnitsSectionEntity(Visitable):
         visitor.visitUnitsSectionEntity(self)
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class PartsSectionEntity(Visitable):
     """Раздел общих деталей"""
 
@@ -106,7 +181,7 @@ class PartsSectionEntity(Visitable):
         visitor.visitPartsEntity(self)
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class ProjectEntity(Visitable):
     """Сущность проекта"""
 
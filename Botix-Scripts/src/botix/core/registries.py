@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC
-from itertools import chain
+from collections import ChainMap
 from typing import Mapping
 from typing import Optional
 
@@ -13,21 +13,49 @@ from botix.core.entities import UnitsSectionEntity
 from botix.core.key import Key
 from botix.core.key import PartKey
 from botix.core.key import UnitKey
+from botix.core.versions import VersionIndex
 
 
 class EntityRegistry[K: Key, T](ABC):
     """Реестр ключ - Сущность"""
 
-    def __init__(self, entities: Mapping[K, T]) -> None:
+    def __init__(self, entities: Mapping[K, T], parent: Optional[EntityRegistry[K, T]] = None) -> None:
+        """
+        :param entities: Сущности данного слоя
+        :param parent: Нижележащий реестр (поиск продолжается в нём, данные не копируются)
+        """
         self.__entities = entities
+        self.__parent = parent
+        self.__versions: Optional[VersionIndex[T]] = None
 
     def get(self, key: K) -> Optional[T]:
-        """Получить значение"""
-        return self.__entities.get(key)
+        """
+        Получить значение (сначала в данном слое, затем в нижележащем реестре).
+        Ключ без версии соответствует последней версии сущности
+        """
+        ret = self.__entities.get(key)
+
+        if ret is None:
+            ret = self.getVersions().resolve(key)
+
+        if ret is None and self.__parent is not None:
+            return self.__parent.get(key)
+
+        return ret
+
+    def getVersions(self) -> VersionIndex[T]:
+        """Получить индекс версий данного слоя"""
+        if self.__versions is None:
+            self.__versions = VersionIndex.ofKeys(self.__entities)
+
+        return self.__versions
 
     def getAll(self) -> Mapping[K, T]:
-        """Получить вид на данные реестра"""
-        return self.__entities
+        """Получить вид на данные реестра (с учётом нижележащего реестра)"""
+        if self.__parent is None:
+            return self.__entities
+
+        return ChainMap(self.__entities, self.__parent.getAll())
 
 
 class UnitEntityRegistry(EntityRegistry[UnitKey, UnitEntity]):
@@ -65,13 +93,11 @@ class PartsSectionRegistry(EntityRegistry[PartKey, PartEntity]):
 class PartEntityRegistry(EntityRegistry[PartKey, PartEntity]):
     """Реестр деталей"""
 
-    def __init__(self, unit: UnitEntity, parts_registry: PartsSectionRegistry) -> None:
+    def __init__(self, unit: UnitEntity, parts_registry: EntityRegistry[PartKey, PartEntity]) -> None:
         super().__init__(
-            dict(chain(
-                (
-                    (PartKey(part.metadata.getEntityName()), part)
-                    for part in unit.parts
-                ),
-                parts_registry.getAll().items()
-            ))
+            {
+                PartKey(part.metadata.getEntityName()): part
+                for part in unit.parts
+            },
+            parts_registry
         )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from bisect import bisect_right
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+
+from botix.core.entities import MetadataEntity
+from botix.core.key import Key
+
+
+class VersionIndex[T]:
+    """
+    Индекс версий.
+    Значения сгруппированы по имени без версии ('Раздел/Слова-Имени') и упорядочены по версии
+    """
+
+    def __init__(self, items: Iterable[tuple[str, int, T]]) -> None:
+        """
+        :param items: Имя без версии, версия, значение
+        """
+        groups = dict[str, dict[int, T]]()
+
+        for name, version, value in items:
+            groups.setdefault(name, dict())[version] = value
+
+        self.__groups: Mapping[str, tuple[Sequence[int], Sequence[T]]] = {
+            name: (tuple(sorted(versions)), tuple(versions[v] for v in sorted(versions)))
+            for name, versions in groups.items()
+        }
+
+    @classmethod
+    def ofKeys(cls, entities: Mapping[Key | str, T]) -> VersionIndex[T]:
+        """Построить индекс по ключам ('Раздел/Слова-Имени-vN' или 'Слова-Имени-vN')"""
+        return cls(
+            (name, version, value)
+            for key, value in entities.items()
+            for name, version in (cls.parseKey(key),)
+            if version is not None
+        )
+
+    @staticmethod
+    def parseKey(key: Key | str) -> tuple[str, Optional[int]]:
+        """Разобрать ключ на имя без версии и версию (None - версия не указана)"""
+        prefix, slash, name = str(key).rpartition('/')
+        words, version = MetadataEntity.parseName(name)
+        return f"{prefix}{slash}{MetadataEntity.parse_words_delimiter.join(words)}", version
+
+    def get(self, name: str, version: int) -> Optional[T]:
+        """Значение данной версии"""
+        versions, values = self.__groups.get(name, ((), ()))
+        i = bisect_left(versions, version)
+        return values[i] if i < len(versions) and versions[i] == version else None
+
+    def getLatest(self, name: str) -> Optional[T]:
+        """Значение последней версии"""
+        group = self.__groups.get(name)
+        return None if group is None else group[1][-1]
+
+    def getVersions(self, name: str) -> Sequence[int]:
+        """Все версии по возрастанию"""
+        return self.__groups.get(name, ((), ()))[0]
+
+    def getRange(self, name: str, first: int, last: int) -> Sequence[T]:
+        """Значения версий из отрезка [first, last] по возрастанию версии"""
+        versions, values = self.__groups.get(name, ((), ()))
+        return values[bisect_left(versions, first):bisect_right(versions, last)]
+
+    def resolve(self, key: Key | str) -> Optional[T]:
+        """Значение по ключу: указанной версии или последней, если версия не указана"""
+        name, version = self.parseKey(key)
+        return self.getLatest(name) if version is None else self.get(name, version)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__groups
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__groups)
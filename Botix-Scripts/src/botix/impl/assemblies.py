@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import ClassVar
+from typing import Sequence
+
+from botix.core.entities import UnitEntity
+from kompas.api.v23 import DocumentReader
+from kompas.api.v23 import EmbeddedPart
+from kompas.api.v23 import default_reader
+
+
+class AssemblyDocuments:
+    """Документы сборок сборочных единиц"""
+
+    assembly_suffix: ClassVar = ".a3d"
+    """Суффикс документа сборки"""
+
+    def __init__(self, reader: DocumentReader = default_reader) -> None:
+        self.__reader = reader
+
+    def getAssembly(self, unit: UnitEntity) -> Path:
+        """Путь к документу сборки ('Каталог/Имя-сущности.a3d')"""
+        return unit.metadata.path / f"{unit.metadata.getEntityName()}{self.assembly_suffix}"
+
+    def getEmbeddedParts(self, unit: UnitEntity) -> Sequence[EmbeddedPart]:
+        """
+        Локальные детали, хранящиеся в документе сборки.
+        Пусто, если документа сборки нет
+        :raises ContainerError: документ сборки повреждён
+        :raises OSError: документ сборки не удалось прочитать
+        """
+        try:
+            return self.__reader.getEmbeddedParts(self.getAssembly(unit))
+
+        except FileNotFoundError:
+            return ()
+
+
+default_assemblies = AssemblyDocuments()
+"""Общий экземпляр службы документов сборок"""
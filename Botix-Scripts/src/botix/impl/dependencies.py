@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from pathlib import PureWindowsPath
+from typing import Callable
+from typing import ClassVar
+from typing import Iterable
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+
+from botix.core.entities import ProjectEntity
+from botix.core.entities import UnitEntity
+from botix.tools import DirectorySnapshot
+from botix.tools import ExtensionsMatcher
+from kompas.api.v23 import ContainerError
+from kompas.api.v23 import DocumentLinks
+from kompas.api.v23 import DocumentReader
+from kompas.api.v23 import ResourceInfo
+from kompas.api.v23 import default_reader
+
+
+class DependencyGraph:
+    """
+    Граф зависимостей сборок от файлов моделей (по записям Sources и resourcesInfo документов сборок).
+    Хранит прямой (сборка -> файлы) и обратный (файл -> сборки) индексы смежности
+    """
+
+    assembly_extensions: ClassVar = ExtensionsMatcher(("a3d",))
+
+    def __init__(
+            self,
+            links: Mapping[Path, DocumentLinks],
+            failed: Optional[Mapping[Path, str]] = None,
+            exists: Callable[[Path], bool] = os.path.isfile,
+    ) -> None:
+        """
+        :param links: Связи документов сборок по пути
+        :param failed: Сборки, документы которых не удалось прочитать (с описанием ошибки)
+        :param exists: Проверка существования файла источника
+        """
+        dependencies = dict[Path, tuple[Path, ...]]()
+        dependents = dict[Path, list[Path]]()
+        unresolved = dict[Path, tuple[str, ...]]()
+
+        for assembly, document_links in links.items():
+            assembly = self._normalize(assembly)
+            paths = list[Path]()
+            missing = list[str]()
+
+            for source in document_links.sources:
+                if source.isEmbedded():
+                    continue
+
+                path = self._resolveSource(assembly, source.path)
+
+                if path is not None and exists(path):
+                    paths.append(path)
+                else:
+                    missing.append(source.path)
+
+            dependencies[assembly] = tuple(paths)
+
+            for path in paths:
+                dependents.setdefault(path, []).append(assembly)
+
+            if missing:
+                unresolved[assembly] = tuple(missing)
+
+        self.__dependencies: Mapping[Path, Sequence[Path]] = dependencies
+        self.__dependents: Mapping[Path, Sequence[Path]] = {path: tuple(v) for path, v in dependents.items()}
+        self.__resources: Mapping[Path, Sequence[ResourceInfo]] = {
+            self._normalize(assembly): document_links.resources
+            for assembly, document_links in links.items()
+        }
+        self.unresolved: Mapping[Path, Sequence[str]] = unresolved
+        """
+        Источники, не найденные в дереве моделей, по сборке:
+        абсолютные пути Windows и относительные пути к отсутствующим файлам (например, после переименования каталога)
+        """
+        self.failed: Mapping[Path, str] = {self._normalize(path): error for path, error in (failed or {}).items()}
+        """Сборки, документы которых не удалось прочитать (повреждены или не синхронизированы), с описанием ошибки"""
+
+    @classmethod
+    def build(cls, root: Path, workers: int = 1, reader: DocumentReader = default_reader) -> DependencyGraph:
+        """
+        Построить граф по всем сборкам дерева.
+        Из каждой сборки читаются только записи Sources и resourcesInfo
+        :param root: Корневой каталог моделей
+        :param workers: Количество потоков чтения документов
+        :param reader: Чтение документов (с кэшем по размеру и времени изменения)
+        """
+        assert workers > 0
+
+        root = cls._normalize(root)
+        snapshot = DirectorySnapshot.scan(root)
+        assemblies = tuple(cls.assembly_extensions.find(root, "*", snapshot))
+
+        def _read(path: Path) -> DocumentLinks | ContainerError:
+            try:
+                return reader.getLinks(path)
+
+            except ContainerError as e:
+                return e
+
+        def _exists(path: Path) -> bool:
+            # Файлы дерева проверяются по уже полученному снимку
+            if snapshot.covers(path.parent):
+                return snapshot.isFile(path)
+
+            return path.is_file()
+
+        if workers == 1:
+            results = tuple(map(_read, assemblies))
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="botix-dependencies") as executor:
+                results = tuple(executor.map(_read, assemblies))
+
+        return cls(
+            {path: result for path, result in zip(assemblies, results) if isinstance(result, DocumentLinks)},
+            {path: str(result) for path, result in zip(assemblies, results) if isinstance(result, ContainerError)},
+            _exists,
+        )
+
+    def getAssemblies(self) -> Iterable[Path]:
+        """Все сборки графа"""
+        return self.__dependencies.keys()
+
+    def getDependencies(self, assembly: Path) -> Sequence[Path]:
+        """Файлы, на которые ссылается сборка"""
+        return self.__dependencies.get(self._normalize(assembly), ())
+
+    def getDependents(self, path: Path) -> Sequence[Path]:
+        """Сборки, непосредственно ссылающиеся на файл"""
+        return self.__dependents.get(self._normalize(path), ())
+
+    def getResources(self, assembly: Path) -> Sequence[ResourceInfo]:
+        """Вложенные ресурсы сборки с хэшами"""
+        return self.__resources.get(self._normalize(assembly), ())
+
+    def getAffected(self, path: Path) -> Sequence[Path]:
+        """Сборки, затронутые изменением файла: прямо или через вложенные сборки (в порядке удаления от файла)"""
+        ret = list[Path]()
+        visited = {self._normalize(path)}
+        frontier = list(visited)
+
+        while frontier:
+            following = list[Path]()
+
+            for p in frontier:
+                for assembly in self.__dependents.get(p, ()):
+                    if assembly not in visited:
+                        visited.add(assembly)
+                        following.append(assembly)
+
+            ret.extend(following)
+            frontier = following
+
+        return ret
+
+    def getAffectedUnits(self, project: ProjectEntity, path: Path) -> Sequence[UnitEntity]:
+        """
+        Сборочные единицы проекта, затронутые изменением файла.
+        Как и при загрузке единицы, её составом считаются файлы её каталога и родительского каталога,
+        а также все сборки, ссылающиеся на них
+        """
+        units = {
+            self._normalize(unit.metadata.path): unit
+            for section in project.units_sections
+            for unit in section.units
+        }
+        units_by_parent = dict[Path, list[Path]]()
+
+        for folder in units:
+            units_by_parent.setdefault(folder.parent, []).append(folder)
+
+        folders = dict[Path, None]()
+
+        for p in (self._normalize(path), *self.getAffected(path)):
+            for folder in (p.parent, *units_by_parent.get(p.parent, ())):
+                if folder in units:
+                    folders[folder] = None
+
+        return tuple(units[folder] for folder in folders)
+
+    @classmethod
+    def _resolveSource(cls, assembly: Path, source: str) -> Optional[Path]:
+        """Путь к источнику (None - абсолютный путь Windows, вне дерева моделей)"""
+        windows = PureWindowsPath(source)
+
+        if windows.drive or windows.root:
+            return None
+
+        return cls._normalize(assembly.parent.joinpath(*windows.parts))
+
+    @staticmethod
+    def _normalize(path: Path) -> Path:
+        return Path(os.path.normpath(path))
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from stat import S_ISDIR
+from typing import ClassVar
+from typing import Optional
+
+from botix.core.entities import MetadataEntity
+from kompas.api.v23 import Container
+from kompas.api.v23 import ContainerError
+
+
+class FingerprintService:
+    """
+    Отпечатки содержимого файлов для обнаружения изменений.
+    Документы КОМПАС и другие zip-контейнеры - по центральному каталогу (CRC-32 и размеры записей),
+    остальные файлы (.stp, .dxf, ...) - потоковым BLAKE2b содержимого.
+    Отпечатки файлов запоминаются до изменения inode, размера или времени изменения
+    """
+
+    zip_prefix: ClassVar = "zip:"
+    """Префикс отпечатка zip-контейнера"""
+    content_prefix: ClassVar = "blake2b:"
+    """Префикс отпечатка по содержимому"""
+    folder_prefix: ClassVar = "folder:"
+    """Префикс отпечатка каталога"""
+    chunk_size: ClassVar = 1 << 20
+    """Размер блока чтения при хэшировании содержимого"""
+
+    def __init__(self) -> None:
+        self.__cache = dict[Path, tuple[tuple[int, int, int], str]]()
+        self.__lock = threading.Lock()
+
+    def get(self, path: Path) -> str:
+        """
+        Получить отпечаток файла.
+        Отпечаток каталога составляется из отпечатков его файлов (без вложенных каталогов)
+        """
+        stat = os.stat(path)
+
+        if S_ISDIR(stat.st_mode):
+            return self._getFolder(path)
+
+        stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        with self.__lock:
+            cached = self.__cache.get(path)
+
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        ret = self.compute(path)
+
+        with self.__lock:
+            self.__cache[path] = (stamp, ret)
+
+        return ret
+
+    def getEntity(self, metadata: MetadataEntity) -> str:
+        """Отпечаток содержимого сущности (файла модели детали или каталога сборочной единицы)"""
+        return self.get(metadata.path)
+
+    @classmethod
+    def compute(cls, path: Path) -> str:
+        """Вычислить отпечаток файла без кэша"""
+        try:
+            with Container(path) as container:
+                return cls.zip_prefix + container.getFingerprint()
+
+        except ContainerError:
+            pass
+
+        h = hashlib.blake2b()
+
+        with open(path, "rb") as f:
+            while chunk := f.read(cls.chunk_size):
+                h.update(chunk)
+
+        return cls.content_prefix + h.hexdigest()
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Сбросить отпечаток файла (None - все отпечатки)"""
+        with self.__lock:
+            if path is None:
+                self.__cache.clear()
+
+            else:
+                self.__cache.pop(path, None)
+
+    def _getFolder(self, folder: Path) -> str:
+        h = hashlib.blake2b()
+
+        with os.scandir(folder) as it:
+            files = sorted(entry.name for entry in it if entry.is_file())
+
+        for name in files:
+            h.update(f"{name}\0{self.get(folder / name)}\n".encode("utf-8"))
+
+        return self.folder_prefix + h.hexdigest()
+
+
+default_fingerprints = FingerprintService()
+"""Общий экземпляр службы отпечатков"""
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from itertools import chain
 from pathlib import Path
 from typing import Any
 from typing import ClassVar
+from typing import Iterable
+from typing import Iterator
 from typing import Mapping
 from typing import Optional
+from typing import Sequence
 
 from botix.abc.loaders import AttributesLoader
 from botix.abc.loaders import EntityLoader
@@ -19,9 +24,16 @@ from botix.core.entities import ProjectEntity
 from botix.core.entities import UnitEntity
 from botix.core.entities import UnitsSectionEntity
 from botix.core.key import PartKey
+from botix.tools import DirectorySnapshot
 from botix.tools import ExtensionsMatcher
 from botix.tools import iterDirs
 
+type LoadStreamItem = (
+        UnitsSectionAttributes | UnitEntity | UnitsSectionEntity
+        | PartsSectionAttributes | PartEntity | PartsSectionEntity
+)
+"""Элемент потока загрузки проекта"""
+
 
 class MetadataEntityLoader(EntityLoader[MetadataEntity]):
     """Загрузчик Метаданных"""
@@ -32,14 +44,7 @@ class MetadataEntityLoader(EntityLoader[MetadataEntity]):
     """Расширение файла изображения"""
 
     def load(self) -> MetadataEntity:
-        words = self.name().split(MetadataEntity.parse_words_delimiter)
-
-        if words[-1].lower().startswith(MetadataEntity.version_prefix):
-            *words, version_string = words
-            pure_version_string = version_string[slice(len(MetadataEntity.version_prefix), None)]
-            v = int(pure_version_string)
-        else:
-            v = self.default_version
+        words, v = self._parseName()
 
         return MetadataEntity(
             path=self._path,
@@ -49,11 +54,29 @@ class MetadataEntityLoader(EntityLoader[MetadataEntity]):
                 (
                     path
                     for e in self.image_extensions.extensions
-                    if (path := Path(self.folder() / f"{self.name()}.{e}")).exists()
-                ), self.image_extensions.find(self.folder(), f"{self.name()}{MetadataEntity.parse_words_delimiter}*")
+                    if self._isFile(path := Path(self.folder() / f"{self.name()}.{e}"))
+                ), self.image_extensions.find(
+                    self.folder(),
+                    f"{self.name()}{MetadataEntity.parse_words_delimiter}*",
+                    self._snapshot
+                )
             ))
         )
 
+    def entityName(self) -> str:
+        """Имя сущности (без загрузки метаданных)"""
+        return MetadataEntity.makeEntityName(*self._parseName())
+
+    def _parseName(self) -> tuple[Sequence[str], int]:
+        words, version = MetadataEntity.parseName(self.name())
+        return words, self.default_version if version is None else version
+
+    def _isFile(self, path: Path) -> bool:
+        if self._snapshot is not None and self._snapshot.covers(path.parent):
+            return self._snapshot.isFile(path)
+
+        return path.exists()
+
 
 class PartEntityLoader(EntityLoader[PartEntity]):
     """Загрузчик сущности представления детали"""
@@ -70,10 +93,25 @@ class PartEntityLoader(EntityLoader[PartEntity]):
     """Переходные форматы деталей"""
 
     def load(self) -> PartEntity:
-        """Создать представление детали"""
+        """Создать представление детали (одно на путь в пределах загрузки проекта)"""
+        if self._cache is None:
+            return self._make()
+
+        part = self._cache.get(self._path)
+
+        if part is None:
+            part = self._cache.setdefault(self._path, self._make())
+
+        return part
+
+    def entityName(self) -> str:
+        """Имя сущности детали (без загрузки)"""
+        return MetadataEntityLoader(self._path).entityName()
+
+    def _make(self) -> PartEntity:
         return PartEntity(
-            metadata=MetadataEntityLoader(self._path).load(),
-            transitions=tuple(self.transition_extensions.find(self.folder(), self.name())),
+            metadata=MetadataEntityLoader(self._path, self._snapshot).load(),
+            transitions=tuple(self.transition_extensions.find(self.folder(), self.name(), self._snapshot)),
         )
 
 
@@ -96,16 +134,27 @@ class PartsSectionEntityLoader(EntityLoader[PartsSectionEntity]):
     part_extensions: ClassVar = ExtensionsMatcher(("m3d",))
 
     def load(self) -> PartsSectionEntity:
-        attributes = PartsSectionAttributesLoader(self.folder()).load()
+        attributes = self.loadAttributes()
         return PartsSectionEntity(
             attributes=attributes,
             parts=tuple(
-                PartEntityLoader(part_path).load()
-                for category_path in iterDirs(self.folder(), attributes.level)
-                for part_path in self.part_extensions.find(category_path, "*")
+                loader.load()
+                for loader in self.iterPartLoaders(attributes)
             )
         )
 
+    def loadAttributes(self) -> PartsSectionAttributes:
+        """Загрузить атрибуты раздела"""
+        return PartsSectionAttributesLoader(self.folder()).load()
+
+    def iterPartLoaders(self, attributes: PartsSectionAttributes) -> Iterable[PartEntityLoader]:
+        """Загрузчики деталей раздела"""
+        return (
+            PartEntityLoader(part_path, self._snapshot, self._cache)
+            for category_path in iterDirs(self.folder(), attributes.level, self._snapshot, self.ignored_folders)
+            for part_path in self.part_extensions.find(category_path, "*", self._snapshot)
+        )
+
     def folder(self) -> Path:
         return self._path
 
@@ -128,16 +177,27 @@ class UnitsSectionEntityLoader(EntityLoader[UnitsSectionEntity]):
     """Загрузчик разделов сборочных единиц"""
 
     def load(self) -> UnitsSectionEntity:
-        attributes = UnitsSectionAttributesLoader(self.folder()).load()
+        attributes = self.loadAttributes()
 
         return UnitsSectionEntity(
             attributes=attributes,
             units=tuple(
-                UnitEntityLoader(unit_path).load()
-                for unit_path in iterDirs(self.folder(), attributes.level)
+                loader.load()
+                for loader in self.iterUnitLoaders(attributes)
             )
         )
 
+    def loadAttributes(self) -> UnitsSectionAttributes:
+        """Загрузить атрибуты раздела"""
+        return UnitsSectionAttributesLoader(self.folder()).load()
+
+    def iterUnitLoaders(self, attributes: UnitsSectionAttributes) -> Iterable[UnitEntityLoader]:
+        """Загрузчики сборочных единиц раздела"""
+        return (
+            UnitEntityLoader(unit_path, self._snapshot, self._cache)
+            for unit_path in iterDirs(self.folder(), attributes.level, self._snapshot, self.ignored_folders)
+        )
+
     def folder(self) -> Path:
         return self._path
 
@@ -171,16 +231,16 @@ class UnitEntityLoader(EntityLoader[UnitEntity]):
     transition_assembly_extensions: ClassVar = ExtensionsMatcher(("stp", "step"))
 
     def load(self) -> UnitEntity:
-        metadata = UnitMetadataEntityLoader(self._path).load()
+        metadata = UnitMetadataEntityLoader(self._path, self._snapshot).load()
         return UnitEntity(
             metadata=metadata,
             transition_assembly=self._tryLoadTransitionAssembly(metadata.getEntityName()),
             parts=tuple(
-                PartEntityLoader(path).load()
+                PartEntityLoader(path, self._snapshot, self._cache).load()
                 for path in
                 chain(
-                    self.part_extensions.find(self.folder(), "*"),
-                    self.part_extensions.find(self.folder().parent, "*"),
+                    self.part_extensions.find(self.folder(), "*", self._snapshot),
+                    self.part_extensions.find(self.folder().parent, "*", self._snapshot),
                 )
             ),
             attributes=self._tryLoadAttributes()
@@ -192,33 +252,140 @@ class UnitEntityLoader(EntityLoader[UnitEntity]):
     def folder(self) -> Path:
         return self._path
 
+    def entityName(self) -> str:
+        """Имя сущности сборочной единицы (без загрузки)"""
+        return UnitMetadataEntityLoader(self._path).entityName()
+
     def _tryLoadTransitionAssembly(self, assembly_name: str) -> Optional[Path]:
-        e = tuple(self.transition_assembly_extensions.find(self.folder(), assembly_name))
+        e = tuple(self.transition_assembly_extensions.find(self.folder(), assembly_name, self._snapshot))
         return e[0] if e else None
 
     def _tryLoadAttributes(self) -> Optional[UnitAttributes]:
-        a = UnitAttributesLoader(self.folder())
+        a = UnitAttributesLoader(self.folder(), self._snapshot)
         return a.load() if a.exists() else None
 
 
+@dataclass(frozen=True)
 class ProjectEntityLoader(EntityLoader[ProjectEntity]):
     """Загрузчик проекта"""
 
+    workers: int = 1
+    """Количество потоков загрузки (1 - последовательная загрузка)"""
+
     def load(self) -> ProjectEntity:
+        assert self.workers > 0
+
+        if self.workers == 1:
+            return self._loadSerial()
+
+        return self._loadParallel(self._findSections())
+
+    def iterLoad(self) -> Iterator[LoadStreamItem]:
+        """
+        Загружать проект последовательно, выдавая сущности по мере готовности.
+        Для каждого раздела: его атрибуты, затем сборочные единицы (детали), затем сам раздел.
+        Загрузчик хранит не более одного раздела
+        """
+        for p, is_units_section, is_parts_section in self._findSections():
+            snapshot = DirectorySnapshot.scan(p)
+            cache = dict()
+
+            if is_units_section:
+                loader = UnitsSectionEntityLoader(p, snapshot, cache)
+                attributes = loader.loadAttributes()
+                yield attributes
+
+                units = list()
+
+                for unit_loader in loader.iterUnitLoaders(attributes):
+                    unit = unit_loader.load()
+                    units.append(unit)
+                    yield unit
+
+                yield UnitsSectionEntity(attributes=attributes, units=tuple(units))
+
+            if is_parts_section:
+                loader = PartsSectionEntityLoader(p, snapshot, cache)
+                attributes = loader.loadAttributes()
+                yield attributes
+
+                parts = list()
+
+                for part_loader in loader.iterPartLoaders(attributes):
+                    part = part_loader.load()
+                    parts.append(part)
+                    yield part
+
+                yield PartsSectionEntity(attributes=attributes, parts=tuple(parts))
+
+    def folder(self) -> Path:
+        return self._path
+
+    def _findSections(self) -> Sequence[tuple[Path, bool, bool]]:
+        """Каталоги разделов и признаки раздела сборочных единиц / общих деталей"""
+        sections = list()
+
+        for p in iterDirs(self.folder(), ignore=self.ignored_folders):
+            is_units_section = UnitsSectionAttributesLoader(p).exists()
+            is_parts_section = PartsSectionAttributesLoader(p).exists()
+
+            if is_units_section or is_parts_section:
+                sections.append((p, is_units_section, is_parts_section))
+
+        return sections
+
+    def _loadSerial(self) -> ProjectEntity:
         units_sections = list()
         parts_sections = list()
 
-        for p in iterDirs(self.folder()):
-            if UnitsSectionAttributesLoader(p).exists():
-                units_sections.append(UnitsSectionEntityLoader(p).load())
+        for item in self.iterLoad():
+            if isinstance(item, UnitsSectionEntity):
+                units_sections.append(item)
 
-            if PartsSectionAttributesLoader(p).exists():
-                parts_sections.append(PartsSectionEntityLoader(p).load())
+            elif isinstance(item, PartsSectionEntity):
+                parts_sections.append(item)
 
         return ProjectEntity(
             units_sections=units_sections,
             parts_sections=parts_sections
         )
 
-    def folder(self) -> Path:
-        return self._path
+    def _loadParallel(self, sections: Sequence[tuple[Path, bool, bool]]) -> ProjectEntity:
+        """
+        Разделы сканируются, а сборочные единицы и детали загружаются в пуле потоков.
+        Задачи ставятся только из вызывающего потока, результаты собираются в порядке последовательной загрузки
+        """
+        pending_units = list()
+        pending_parts = list()
+        cache = dict()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="botix-loader") as executor:
+            snapshots = executor.map(DirectorySnapshot.scan, (p for p, _, _ in sections))
+
+            for (p, is_units_section, is_parts_section), snapshot in zip(sections, snapshots):
+                if is_units_section:
+                    loader = UnitsSectionEntityLoader(p, snapshot, cache)
+                    attributes = loader.loadAttributes()
+                    pending_units.append((attributes, tuple(
+                        executor.submit(unit_loader.load)
+                        for unit_loader in loader.iterUnitLoaders(attributes)
+                    )))
+
+                if is_parts_section:
+                    loader = PartsSectionEntityLoader(p, snapshot, cache)
+                    attributes = loader.loadAttributes()
+                    pending_parts.append((attributes, tuple(
+                        executor.submit(part_loader.load)
+                        for part_loader in loader.iterPartLoaders(attributes)
+                    )))
+
+            return ProjectEntity(
+                units_sections=[
+                    UnitsSectionEntity(attributes=attributes, units=tuple(f.result() for f in futures))
+                    for attributes, futures in pending_units
+                ],
+                parts_sections=[
+                    PartsSectionEntity(attributes=attributes, parts=tuple(f.result() for f in futures))
+                    for attributes, futures in pending_parts
+                ]
+            )
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from pathlib import Path
+from typing import Mapping
+from typing import Optional
+
+from botix.abc.loaders import EntityLoader
+from botix.core.entities import PartEntity
+from botix.core.entities import UnitEntity
+from botix.core.key import Key
+from botix.core.key import PartKey
+from botix.core.key import UnitKey
+from botix.core.registries import EntityRegistry
+from botix.core.versions import VersionIndex
+from botix.impl.loaders import PartsSectionAttributesLoader
+from botix.impl.loaders import PartsSectionEntityLoader
+from botix.impl.loaders import UnitEntityLoader
+from botix.impl.loaders import UnitsSectionAttributesLoader
+from botix.impl.loaders import UnitsSectionEntityLoader
+from botix.tools import DirectorySnapshot
+from botix.tools import iterDirs
+
+
+class LazyEntityRegistry[K: Key, T](EntityRegistry[K, T], ABC):
+    """
+    Реестр, загружающий сущности по запросу ключа.
+    Ключ 'Раздел/Имя-сущности' определяет раздел: в нём составляется индекс имён (без загрузки сущностей),
+    затем загружается только запрошенная сущность. Индексы и сущности запоминаются
+    """
+
+    def __init__(self, root: Path) -> None:
+        """
+        :param root: Корневой каталог моделей
+        """
+        self.__entities = dict[K, T]()
+        super().__init__(self.__entities)
+        self._root = root
+        """Корневой каталог моделей"""
+        self._cache = dict()
+        """Загруженные сущности по пути"""
+        self.__indexes = dict[str, Mapping[str, EntityLoader[T]]]()
+        self.__versions = dict[str, VersionIndex[str]]()
+
+    def get(self, key: K) -> Optional[T]:
+        ret = self.__entities.get(key)
+
+        if ret is not None:
+            return ret
+
+        section_name, _, name = str(key).partition('/')
+        index = self._getIndex(section_name)
+
+        if name not in index:
+            name = self._getSectionVersions(section_name).resolve(name)
+
+            if name is None:
+                return None
+
+            return self.get(self._makeKey(section_name, name))
+
+        return self.__entities.setdefault(key, self._load(index[name]))
+
+    def getAll(self) -> Mapping[K, T]:
+        """Загрузить все сущности реестра"""
+        for section in iterDirs(self._root, ignore=EntityLoader.ignored_folders):
+            for name in self._getIndex(section.name):
+                self.get(self._makeKey(section.name, name))
+
+        return super().getAll()
+
+    def getVersions(self) -> VersionIndex[T]:
+        """Получить индекс версий (загружает все сущности реестра)"""
+        return VersionIndex.ofKeys(self.getAll())
+
+    def _getIndex(self, section_name: str) -> Mapping[str, EntityLoader[T]]:
+        index = self.__indexes.get(section_name)
+
+        if index is None:
+            index = self.__indexes[section_name] = self._makeIndex(self._root / section_name)
+
+        return index
+
+    def _getSectionVersions(self, section_name: str) -> VersionIndex[str]:
+        versions = self.__versions.get(section_name)
+
+        if versions is None:
+            versions = self.__versions[section_name] = VersionIndex.ofKeys({
+                name: name
+                for name in self._getIndex(section_name)
+            })
+
+        return versions
+
+    @abstractmethod
+    def _makeIndex(self, section: Path) -> Mapping[str, EntityLoader[T]]:
+        """Загрузчики сущностей раздела по имени сущности (пустой, если каталог не является разделом)"""
+
+    @abstractmethod
+    def _makeKey(self, section_name: str, name: str) -> K:
+        """Ключ сущности раздела"""
+
+    def _load(self, loader: EntityLoader[T]) -> T:
+        """Загрузить сущность"""
+        return loader.load()
+
+
+class LazyUnitEntityRegistry(LazyEntityRegistry[UnitKey, UnitEntity]):
+    """Реестр сборочных единиц с загрузкой по запросу (ключи как у UnitEntityRegistry)"""
+
+    def _makeIndex(self, section: Path) -> Mapping[str, EntityLoader[UnitEntity]]:
+        if not UnitsSectionAttributesLoader(section).exists():
+            return {}
+
+        loader = UnitsSectionEntityLoader(section, None, self._cache)
+        return {
+            unit_loader.entityName(): unit_loader
+            for unit_loader in loader.iterUnitLoaders(loader.loadAttributes())
+        }
+
+    def _makeKey(self, section_name: str, name: str) -> UnitKey:
+        return UnitKey(f"{section_name}/{name}")
+
+    def _load(self, loader: EntityLoader[UnitEntity]) -> UnitEntity:
+        # Сборочная единица ищет детали в своём каталоге и в родительском: достаточно снимка родительского
+        folder = loader.folder()
+        return UnitEntityLoader(folder, DirectorySnapshot.scan(folder.parent), self._cache).load()
+
+
+class LazyPartsSectionRegistry(LazyEntityRegistry[PartKey, PartEntity]):
+    """Реестр общих деталей с загрузкой по запросу (ключи как у PartsSectionRegistry)"""
+
+    def _makeIndex(self, section: Path) -> Mapping[str, EntityLoader[PartEntity]]:
+        if not PartsSectionAttributesLoader(section).exists():
+            return {}
+
+        loader = PartsSectionEntityLoader(section, DirectorySnapshot.scan(section), self._cache)
+        return {
+            part_loader.entityName(): part_loader
+            for part_loader in loader.iterPartLoaders(loader.loadAttributes())
+        }
+
+    def _makeKey(self, section_name: str, name: str) -> PartKey:
+        return PartKey(f"{section_name}/{name}")
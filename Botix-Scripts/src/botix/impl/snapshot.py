@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import pickle
+from pathlib import Path
+from typing import ClassVar
+from typing import Optional
+from typing import Sequence
+
+from botix.core.entities import ProjectEntity
+from botix.impl.loaders import ProjectEntityLoader
+
+type Stamps = Sequence[tuple[str, int]]
+"""Пути каталогов и файлов атрибутов с временем изменения"""
+
+
+class ProjectEntitySnapshot:
+    """
+    Двоичный снимок сущности проекта рядом с деревом моделей.
+    Снимок действителен, пока не изменились каталоги дерева и файлы атрибутов
+    """
+
+    format_version: ClassVar = 2
+    """Версия формата снимка"""
+    suffix: ClassVar = ".botix-snapshot"
+    """Суффикс файла снимка"""
+
+    def __init__(self, root: Path, workers: int = 1) -> None:
+        """
+        :param root: Корневой каталог моделей
+        :param workers: Количество потоков загрузки при недействительном снимке
+        """
+        self.root = root
+        """Корневой каталог моделей"""
+        self.path = root.with_name(f".{root.name}{self.suffix}")
+        """Путь к файлу снимка (рядом с корневым каталогом, чтобы запись не меняла время изменения дерева)"""
+        self.workers = workers
+        """Количество потоков загрузки"""
+
+    def load(self) -> ProjectEntity:
+        """Восстановить проект из снимка или загрузить его и сохранить снимок"""
+        project = self.restore()
+
+        if project is None:
+            stamps = self._collectStamps()
+            project = ProjectEntityLoader(self.root, workers=self.workers).load()
+            self.save(project, stamps)
+
+        return project
+
+    def restore(self) -> Optional[ProjectEntity]:
+        """Восстановить проект (None - снимок отсутствует, повреждён или устарел)"""
+        try:
+            with open(self.path, "rb") as f:
+                version, stamps, project = pickle.load(f)
+
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+            return None
+
+        if version != self.format_version or not self._isValid(stamps):
+            return None
+
+        return project
+
+    def save(self, project: ProjectEntity, stamps: Optional[Stamps] = None) -> None:
+        """
+        Сохранить снимок проекта (общие объекты сохраняются один раз)
+        :param project: Проект
+        :param stamps: Состояние дерева на момент начала загрузки (None - текущее)
+        """
+        if stamps is None:
+            stamps = self._collectStamps()
+
+        temporary = self.path.with_name(f"{self.path.name}.tmp")
+
+        with open(temporary, "wb") as f:
+            pickle.dump((self.format_version, stamps, project), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temporary, self.path)
+
+    def invalidate(self) -> None:
+        """Удалить снимок"""
+        self.path.unlink(missing_ok=True)
+
+    def _collectStamps(self) -> Stamps:
+        """Время изменения всех каталогов дерева и файлов атрибутов (имена начинаются с точки)"""
+        ret = list[tuple[str, int]]()
+        stack = [str(self.root)]
+
+        while stack:
+            folder = stack.pop()
+            ret.append((folder, os.stat(folder).st_mtime_ns))
+
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+
+                    elif entry.name.startswith('.'):
+                        ret.append((entry.path, entry.stat().st_mtime_ns))
+
+        return ret
+
+    @staticmethod
+    def _isValid(stamps: Stamps) -> bool:
+        try:
+            return all(
+                os.stat(path).st_mtime_ns == mtime_ns
+                for path, mtime_ns in stamps
+            )
+
+        except OSError:
+            return False
@@ -2,23 +2,37 @@
 Визуализация в текстовом представлении
 """
 
+from contextlib import ExitStack
 from dataclasses import dataclass
+from dataclasses import field
 from typing import ClassVar
+from typing import MutableSequence
 
 from engines.text import FormatTextIOAdapter
-from botix.abc.visitor import EntityVisitor
+from botix.abc.visitor import TraversalVisitor
 from botix.core.entities import MetadataEntity
+from botix.core.attributes import PartsSectionAttributes
+from botix.core.attributes import UnitsSectionAttributes
 from botix.core.entities import PartEntity
+from botix.core.entities import PartsSectionEntity
 from botix.core.entities import ProjectEntity
 from botix.core.entities import UnitsSectionEntity
 from botix.core.entities import UnitEntity
 
 
 @dataclass(frozen=True)
-class TextRenderEntityVisitor(EntityVisitor):
+class TextRenderEntityVisitor(TraversalVisitor):
     metadata_name_width: ClassVar = 32
 
     out: FormatTextIOAdapter
+    _stream_lists: ExitStack = field(init=False, default_factory=ExitStack)
+    """Списки, открытые при обработке потока загрузки"""
+    _traversal_lists: MutableSequence[ExitStack] = field(init=False, default_factory=list)
+    """Списки, открытые при однократном обходе (по уровням вложенности)"""
+    _pending_headers: MutableSequence[str] = field(init=False, default_factory=list)
+    """Заголовок общих деталей проекта, ожидающий первого раздела деталей"""
+    _projects: MutableSequence[ProjectEntity] = field(init=False, default_factory=list)
+    """Проекты, в которые вошёл однократный обход (пустая строка после раздела пишется на уровне проекта)"""
 
     def visitMetadataEntity(self, metadata: MetadataEntity) -> None:
 
@@ -35,12 +49,12 @@ class TextRenderEntityVisitor(EntityVisitor):
     def visitPartEntity(self, part: PartEntity) -> None:
         self.visitMetadataEntity(part.metadata)
 
-        if part.prusa_project or part.transitions:
+        if part.transitions:
             with self.out.markedList():
                 self.out.write("Обменные форматы")
 
                 with self.out.markedList():
-                    if part.prusa_project is not None:
+                    if part.getPrusaProject() is not None:
                         self.out.write("prusa")
 
                     for p in part.transitions:
@@ -53,19 +67,21 @@ class TextRenderEntityVisitor(EntityVisitor):
             for part in unit.parts:
                 self.visitPartEntity(part)
 
-    def visitUnitsSectionEntity(self, section: UnitsSectionEntity) -> None:
-        self.out.write(f"{section.attributes.name} ({len(section.units)})")
-
-        with self.out.markedList():
-            self.out.write(f"{section.attributes.desc}")
-            self.out.write(f"Уровень: {section.attributes.level}")
-
         self.out.write()
 
+    def visitUnitsSectionEntity(self, section: UnitsSectionEntity) -> None:
+        self._writeUnitsSectionHeader(section.attributes, f" ({len(section.units)})")
+
         with self.out.numericList():
             for unit in section.units:
                 self.visitUnitEntity(unit)
-                self.out.write()
+
+    def visitPartsEntity(self, parts_section: PartsSectionEntity) -> None:
+        self._writePartsSectionHeader(parts_section.attributes, f" ({len(parts_section.parts)})")
+
+        with self.out.numericList():
+            for part in parts_section.parts:
+                self.visitPartEntity(part)
 
     def visitProjectEntity(self, project: ProjectEntity) -> None:
         self.out.write(f"РАЗДЕЛЫ: ({len(project.units_sections)})")
@@ -74,3 +90,110 @@ class TextRenderEntityVisitor(EntityVisitor):
         for section in project.units_sections:
             self.visitUnitsSectionEntity(section)
             self.out.write()
+
+        self.out.write(f"ОБЩИЕ ДЕТАЛИ: ({len(project.parts_sections)})")
+        self.out.write()
+
+        for parts_section in project.parts_sections:
+            self.visitPartsEntity(parts_section)
+            self.out.write()
+
+    def beginUnitsSection(self, attributes: UnitsSectionAttributes) -> None:
+        self._writeUnitsSectionHeader(attributes, "")
+        self._stream_lists.enter_context(self.out.numericList())
+
+    def endUnitsSection(self, section: UnitsSectionEntity) -> None:
+        self._stream_lists.close()
+        self.out.write()
+
+    def beginPartsSection(self, attributes: PartsSectionAttributes) -> None:
+        self._writePartsSectionHeader(attributes, "")
+        self._stream_lists.enter_context(self.out.numericList())
+
+    def endPartsSection(self, parts_section: PartsSectionEntity) -> None:
+        self._stream_lists.close()
+        self.out.write()
+
+    def _writeUnitsSectionHeader(self, attributes: UnitsSectionAttributes, count: str) -> None:
+        self.out.write(f"{attributes.name}{count}")
+
+        with self.out.markedList():
+            self.out.write(f"{attributes.desc}")
+            self.out.write(f"Уровень: {attributes.level}")
+
+        self.out.write()
+
+    def _writePartsSectionHeader(self, attributes: PartsSectionAttributes, count: str) -> None:
+        self.out.write(f"{attributes.name}{count}")
+
+        with self.out.markedList():
+            self.out.write(f"Уровень: {attributes.level}")
+
+        self.out.write()
+
+    def enterProjectEntity(self, project: ProjectEntity) -> bool:
+        self.out.write(f"РАЗДЕЛЫ: ({len(project.units_sections)})")
+        self.out.write()
+        self._pending_headers.append(f"ОБЩИЕ ДЕТАЛИ: ({len(project.parts_sections)})")
+        self._projects.append(project)
+        return True
+
+    def leaveProjectEntity(self, project: ProjectEntity) -> None:
+        self._projects.pop()
+        self._writePendingHeader()
+
+    def enterUnitsSectionEntity(self, section: UnitsSectionEntity) -> bool:
+        self._writeUnitsSectionHeader(section.attributes, f" ({len(section.units)})")
+        self._openTraversalList()
+        return True
+
+    def leaveUnitsSectionEntity(self, section: UnitsSectionEntity) -> None:
+        self._closeTraversalList()
+        self._writeSectionSeparator()
+
+    def enterPartsSectionEntity(self, parts_section: PartsSectionEntity) -> bool:
+        self._writePendingHeader()
+        self._writePartsSectionHeader(parts_section.attributes, f" ({len(parts_section.parts)})")
+        self._openTraversalList()
+        return True
+
+    def leavePartsSectionEntity(self, parts_section: PartsSectionEntity) -> None:
+        self._closeTraversalList()
+        self._writeSectionSeparator()
+
+    def enterUnitEntity(self, unit: UnitEntity) -> bool:
+        self.visitMetadataEntity(unit.metadata)
+        self._openTraversalList()
+        return True
+
+    def leaveUnitEntity(self, unit: UnitEntity) -> None:
+        self._closeTraversalList()
+        self.out.write()
+
+    def enterPartEntity(self, part: PartEntity) -> bool:
+        self.visitPartEntity(part)
+        return False
+
+    def enterMetadataEntity(self, metadata: MetadataEntity) -> bool:
+        # Метаданные сборочной единицы выводятся при входе в неё, отдельно - только метаданные-корень обхода
+        if not self._traversal_lists:
+            self.visitMetadataEntity(metadata)
+
+        return False
+
+    def _openTraversalList(self) -> None:
+        lists = ExitStack()
+        lists.enter_context(self.out.numericList())
+        self._traversal_lists.append(lists)
+
+    def _closeTraversalList(self) -> None:
+        self._traversal_lists.pop().close()
+
+    def _writeSectionSeparator(self) -> None:
+        if self._projects:
+            self.out.write()
+
+    def _writePendingHeader(self) -> None:
+        if self._pending_headers:
+            self.out.write(self._pending_headers.pop())
+            self.out.write()
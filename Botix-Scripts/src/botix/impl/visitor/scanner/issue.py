@@ -6,9 +6,10 @@ from pathlib import Path
 from typing import MutableSequence
 
 from engines.text import FormatTextIOAdapter
-from botix.abc.visitor import EntityVisitor
+from botix.abc.visitor import TraversalVisitor
 from botix.core.entities import MetadataEntity
 from botix.core.entities import PartEntity
+from botix.core.entities import PartsSectionEntity
 from botix.core.entities import ProjectEntity
 from botix.core.entities import UnitsSectionEntity
 from botix.core.entities import UnitEntity
@@ -36,7 +37,7 @@ class Issue:
 
 
 @dataclass(frozen=True)
-class IssueScannerEntityVisitor(EntityVisitor):
+class IssueScannerEntityVisitor(TraversalVisitor):
     """Сканирующий посетитель на предмет наличия недостатков"""
 
     _issues: MutableSequence[Issue] = field(init=False, default_factory=list)
@@ -64,19 +65,24 @@ class IssueScannerEntityVisitor(EntityVisitor):
     def _warn(self, i: Issue) -> None:
         self._issues.append(i)
 
-    def visitMetadataEntity(self, metadata: MetadataEntity) -> None:
+    def _checkMetadata(self, metadata: MetadataEntity) -> None:
         if not metadata.images:
             self._warn(Issue.fromMetadata(metadata, "Отсутствуют иллюстрации"))
 
-    def visitPartEntity(self, part: PartEntity) -> None:
-        self.visitMetadataEntity(part.metadata)
-
-        if not part.prusa_project:
+    def _checkPart(self, part: PartEntity) -> None:
+        if part.getPrusaProject() is None:
             self._warn(Issue.fromMetadata(part.metadata, "Отсутствует проект PrusaSlicer"))
 
         if not part.transitions:
             self._warn(Issue.fromMetadata(part.metadata, "Отсутствуют файлы обменного формата"))
 
+    def visitMetadataEntity(self, metadata: MetadataEntity) -> None:
+        self._checkMetadata(metadata)
+
+    def visitPartEntity(self, part: PartEntity) -> None:
+        self.visitMetadataEntity(part.metadata)
+        self._checkPart(part)
+
     def visitUnitEntity(self, unit: UnitEntity) -> None:
         self.visitMetadataEntity(unit.metadata)
 
@@ -87,6 +93,21 @@ class IssueScannerEntityVisitor(EntityVisitor):
         for u in section.units:
             self.visitUnitEntity(u)
 
+    def visitPartsEntity(self, parts_section: PartsSectionEntity) -> None:
+        for p in parts_section.parts:
+            self.visitPartEntity(p)
+
     def visitProjectEntity(self, project: ProjectEntity) -> None:
         for s in project.units_sections:
             self.visitUnitsSectionEntity(s)
+
+        for s in project.parts_sections:
+            self.visitPartsEntity(s)
+
+    def enterMetadataEntity(self, metadata: MetadataEntity) -> bool:
+        self._checkMetadata(metadata)
+        return True
+
+    def leavePartEntity(self, part: PartEntity) -> None:
+        # После метаданных детали - как в visitPartEntity
+        self._checkPart(part)
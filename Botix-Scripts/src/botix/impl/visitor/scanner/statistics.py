@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import MutableSet
+
+from engines.text import FormatTextIOAdapter
+from botix.abc.visitor import TraversalVisitor
+from botix.abc.visitor import Visitable
+from botix.core.entities import MetadataEntity
+from botix.core.entities import PartEntity
+from botix.core.entities import PartsSectionEntity
+from botix.core.entities import ProjectEntity
+from botix.core.entities import UnitEntity
+from botix.core.entities import UnitsSectionEntity
+from botix.impl.visitor.traversal import TraversalEngine
+
+
+@dataclass
+class StatisticsEntityVisitor(TraversalVisitor):
+    """Посетитель, собирающий статистику проекта"""
+
+    units_sections: int = field(init=False, default=0)
+    """Разделы сборочных единиц"""
+    parts_sections: int = field(init=False, default=0)
+    """Разделы общих деталей"""
+    units: int = field(init=False, default=0)
+    """Сборочные единицы"""
+    part_entries: int = field(init=False, default=0)
+    """Вхождения деталей (в сборочные единицы и разделы)"""
+    images: int = field(init=False, default=0)
+    """Изображения (по вхождениям сущностей)"""
+    transitions: int = field(init=False, default=0)
+    """Файлы обменного формата (по вхождениям деталей)"""
+    _part_paths: MutableSet[Path] = field(init=False, default_factory=set)
+
+    @property
+    def parts(self) -> int:
+        """Уникальные детали (по пути к модели)"""
+        return len(self._part_paths)
+
+    def write(self, out: FormatTextIOAdapter) -> None:
+        """Записать"""
+        out.write("СТАТИСТИКА")
+
+        with out.markedList():
+            out.write(f"Разделы сборочных единиц: {self.units_sections}")
+            out.write(f"Разделы общих деталей   : {self.parts_sections}")
+            out.write(f"Сборочные единицы       : {self.units}")
+            out.write(f"Детали                  : {self.parts} ({self.part_entries} вхождений)")
+            out.write(f"Изображения             : {self.images}")
+            out.write(f"Обменные форматы        : {self.transitions}")
+
+        out.write()
+
+    def visitMetadataEntity(self, metadata: MetadataEntity) -> None:
+        self._traverse(metadata)
+
+    def visitPartEntity(self, part: PartEntity) -> None:
+        self._traverse(part)
+
+    def visitPartsEntity(self, parts_section: PartsSectionEntity) -> None:
+        self._traverse(parts_section)
+
+    def visitUnitEntity(self, unit: UnitEntity) -> None:
+        self._traverse(unit)
+
+    def visitUnitsSectionEntity(self, units_section: UnitsSectionEntity) -> None:
+        self._traverse(units_section)
+
+    def visitProjectEntity(self, project: ProjectEntity) -> None:
+        self._traverse(project)
+
+    def enterUnitsSectionEntity(self, units_section: UnitsSectionEntity) -> bool:
+        self.units_sections += 1
+        return True
+
+    def enterPartsSectionEntity(self, parts_section: PartsSectionEntity) -> bool:
+        self.parts_sections += 1
+        return True
+
+    def enterUnitEntity(self, unit: UnitEntity) -> bool:
+        self.units += 1
+        return True
+
+    def enterPartEntity(self, part: PartEntity) -> bool:
+        self.part_entries += 1
+        self.transitions += len(part.transitions)
+        self._part_paths.add(part.metadata.path)
+        return True
+
+    def enterMetadataEntity(self, metadata: MetadataEntity) -> bool:
+        self.images += len(metadata.images)
+        return True
+
+    def _traverse(self, root: Visitable) -> None:
+        TraversalEngine((self,)).run(root)
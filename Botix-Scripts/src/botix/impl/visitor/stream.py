@@ -0,0 +1,40 @@
+"""
+Передача потока загрузки посетителю
+"""
+
+from typing import Iterable
+
+from botix.abc.visitor import EntityVisitor
+from botix.core.attributes import PartsSectionAttributes
+from botix.core.attributes import UnitsSectionAttributes
+from botix.core.entities import PartEntity
+from botix.core.entities import PartsSectionEntity
+from botix.core.entities import UnitEntity
+from botix.core.entities import UnitsSectionEntity
+from botix.impl.loaders import LoadStreamItem
+
+
+def consume(visitor: EntityVisitor, stream: Iterable[LoadStreamItem]) -> None:
+    """
+    Передать посетителю поток загрузки (ProjectEntityLoader.iterLoad) по мере поступления.
+    Сборочные единицы и детали посещаются сразу, разделы - только отметками начала и конца
+    """
+    for item in stream:
+        match item:
+            case UnitsSectionAttributes():
+                visitor.beginUnitsSection(item)
+
+            case UnitEntity():
+                visitor.visitUnitEntity(item)
+
+            case UnitsSectionEntity():
+                visitor.endUnitsSection(item)
+
+            case PartsSectionAttributes():
+                visitor.beginPartsSection(item)
+
+            case PartEntity():
+                visitor.visitPartEntity(item)
+
+            case PartsSectionEntity():
+                visitor.endPartsSection(item)
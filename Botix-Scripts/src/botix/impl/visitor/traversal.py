@@ -0,0 +1,109 @@
+"""
+Однократный обход дерева сущностей с передачей узлов нескольким посетителям
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+from typing import ClassVar
+from typing import Mapping
+from typing import Sequence
+
+from botix.abc.visitor import EntityVisitor
+from botix.abc.visitor import TraversalVisitor
+from botix.abc.visitor import Visitable
+from botix.core.entities import MetadataEntity
+from botix.core.entities import PartEntity
+from botix.core.entities import PartsSectionEntity
+from botix.core.entities import ProjectEntity
+from botix.core.entities import UnitEntity
+from botix.core.entities import UnitsSectionEntity
+
+type _Hooks[F] = Sequence[tuple[int, F]]
+"""Переопределённые отметки посетителей для типа узла: индекс посетителя и метод (в порядке посетителей)"""
+
+
+class TraversalEngine:
+    """
+    Обходит дерево сущностей один раз (итеративно, без рекурсии) и передаёт каждый узел всем посетителям.
+    Отметки посетителей выбираются по заранее составленной таблице 'тип узла -> методы'.
+    Посетитель, не являющийся TraversalVisitor, посещает корень через accept() отдельным обходом
+    """
+
+    children: ClassVar[Mapping[type, Callable[[Visitable], Sequence[Visitable]]]] = {
+        ProjectEntity: lambda project: (*project.units_sections, *project.parts_sections),
+        UnitsSectionEntity: lambda units_section: units_section.units,
+        PartsSectionEntity: lambda parts_section: parts_section.parts,
+        UnitEntity: lambda unit: (unit.metadata, *unit.parts),
+        PartEntity: lambda part: (part.metadata,),
+        MetadataEntity: lambda metadata: (),
+    }
+    """Дочерние узлы по типу узла (в порядке посещения)"""
+
+    def __init__(self, visitors: Sequence[EntityVisitor]) -> None:
+        """
+        :param visitors: Посетители (отметки вызываются в порядке посетителей)
+        """
+        self.__traversal_visitors = tuple(v for v in visitors if isinstance(v, TraversalVisitor))
+        self.__other_visitors = tuple(v for v in visitors if not isinstance(v, TraversalVisitor))
+        self.__enters: Mapping[type, _Hooks[Callable[[Visitable], bool]]] = {
+            t: self._getHooks(f"enter{t.__name__}")
+            for t in self.children
+        }
+        self.__leaves: Mapping[type, _Hooks[Callable[[Visitable], None]]] = {
+            t: self._getHooks(f"leave{t.__name__}")
+            for t in self.children
+        }
+
+    def run(self, root: Visitable) -> None:
+        """
+        Обойти дерево с данным корнем
+        :raises TypeError: Корень - не сущность проекта, раздела, сборочной единицы, детали или метаданных
+        """
+        if type(root) not in self.children:
+            raise TypeError(f"Unsupported traversal root: {type(root).__name__}")
+
+        for visitor in self.__other_visitors:
+            root.accept(visitor)
+
+        if not self.__traversal_visitors:
+            return
+
+        # Кадр: узел, индексы посетителей, вошедших в узел, признак выхода
+        stack = [(root, tuple(range(len(self.__traversal_visitors))), False)]
+
+        while stack:
+            node, active, leaving = stack.pop()
+            t = type(node)
+
+            if leaving:
+                for i, leave in self.__leaves[t]:
+                    if i in active:
+                        leave(node)
+
+                continue
+
+            pruned = [
+                i
+                for i, enter in self.__enters[t]
+                if i in active and enter(node) is False
+            ]
+            descending = tuple(i for i in active if i not in pruned) if pruned else active
+
+            if self.__leaves[t]:
+                stack.append((node, active, True))
+
+            if descending:
+                stack.extend(
+                    (child, descending, False)
+                    for child in reversed(self.children[t](node))
+                )
+
+    def _getHooks(self, name: str) -> _Hooks:
+        """Отметки с данным именем, переопределённые посетителями"""
+        default = getattr(TraversalVisitor, name)
+        return tuple(
+            (i, getattr(visitor, name))
+            for i, visitor in enumerate(self.__traversal_visitors)
+            if getattr(type(visitor), name) is not default
+        )
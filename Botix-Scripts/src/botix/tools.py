@@ -1,7 +1,14 @@
+from __future__ import annotations
+
+import os
+from bisect import bisect_left
 from dataclasses import dataclass
+from fnmatch import fnmatch
 from itertools import chain
 from pathlib import Path
 from typing import Iterable
+from typing import Mapping
+from typing import Optional
 from typing import Sequence
 
 
@@ -12,24 +19,192 @@ class ExtensionsMatcher:
     extensions: Sequence[str]
     """Целевые расширения файлов"""
 
-    def find(self, folder: Path, filename_pattern: str) -> Iterable[Path]:
+    def find(self, folder: Path, filename_pattern: str, snapshot: Optional[DirectorySnapshot] = None) -> Iterable[Path]:
         """Получить все пути к файлам по шаблону имени с данными расширениями"""
         patterns = (
             f"{filename_pattern}.{e}"
             for e in self.extensions
         )
+
+        if snapshot is not None and snapshot.covers(folder):
+            return chain(*(snapshot.rglob(folder, p) for p in patterns))
+
         return chain(*(map(folder.rglob, patterns)))
 
 
-def iterDirs(root: Path, level: int = 0) -> Iterable[Path]:
-    """Итерация по каталогам до указанного уровня вложенности"""
+def iterDirs(
+        root: Path,
+        level: int = 0,
+        snapshot: Optional[DirectorySnapshot] = None,
+        ignore: Sequence[str] = ()
+) -> Iterable[Path]:
+    """
+    Итерация по каталогам указанного уровня вложенности (обход в ширину).
+    :param root: Корневой каталог
+    :param level: Уровень вложенности (0 - подкаталоги корня)
+    :param snapshot: Снимок дерева каталогов (каталоги вне снимка читаются через os.scandir)
+    :param ignore: Шаблоны имён пропускаемых каталогов
+    Символическая ссылка на каталог, содержащий текущий (петля), не раскрывается
+    """
     assert level >= 0
 
-    def _subs(_dir: Path) -> Iterable[Path]:
-        return filter(lambda p: p.is_dir(), _dir.iterdir())
+    frontier = [root]
+
+    for _ in range(level + 1):
+        frontier = [
+            sub
+            for folder in frontier
+            for sub, is_symlink in _subdirs(folder, snapshot)
+            if not any(fnmatch(sub.name, pattern) for pattern in ignore)
+            if not (is_symlink and _isLoop(folder, sub))
+        ]
+
+    return frontier
+
+
+def _subdirs(folder: Path, snapshot: Optional[DirectorySnapshot]) -> Iterable[tuple[Path, bool]]:
+    """Подкаталоги и признак символической ссылки"""
+    if snapshot is not None and snapshot.covers(folder):
+        return ((sub, not snapshot.covers(sub)) for sub in snapshot.subdirs(folder))
+
+    with os.scandir(folder) as it:
+        return [
+            (folder / entry.name, entry.is_symlink())
+            for entry in it
+            if entry.is_dir()
+        ]
+
+
+def _isLoop(folder: Path, link: Path) -> bool:
+    """Ссылка указывает на каталог, содержащий данный (или на него самого)"""
+    target = os.path.realpath(link)
+    real_folder = os.path.realpath(folder)
+    return real_folder == target or real_folder.startswith(os.path.join(target, ''))
+
+
+_MAGIC = frozenset("*?[")
+
+
+@dataclass(frozen=True)
+class _SnapshotFolder:
+    """Содержимое каталога в снимке"""
+
+    folders: Sequence[Path]
+    """Подкаталоги"""
+    files: frozenset[str]
+    """Имена файлов (os.path.normcase)"""
+    files_by_extension: Mapping[str, Sequence[tuple[str, Path]]]
+    """Файлы по расширению, упорядоченные по имени (os.path.normcase)"""
+
+    @classmethod
+    def make(cls, folder: Path, folders: Sequence[Path], filenames: Sequence[str]) -> _SnapshotFolder:
+        by_extension = dict[str, list[tuple[str, Path]]]()
+
+        for name in filenames:
+            key = os.path.normcase(name)
+            by_extension.setdefault(key.rpartition('.')[2], list()).append((key, folder / name))
+
+        return cls(
+            folders=tuple(folders),
+            files=frozenset(map(os.path.normcase, filenames)),
+            files_by_extension={
+                extension: tuple(sorted(files))
+                for extension, files in by_extension.items()
+            }
+        )
+
+    def candidates(self, prefix: str, extension: Optional[str]) -> Iterable[tuple[str, Path]]:
+        """Файлы с данным префиксом имени и расширением (None - любое)"""
+        if extension is None:
+            return chain(*(self._withPrefix(files, prefix) for files in self.files_by_extension.values()))
+
+        return self._withPrefix(self.files_by_extension.get(extension, ()), prefix)
+
+    @staticmethod
+    def _withPrefix(files: Sequence[tuple[str, Path]], prefix: str) -> Iterable[tuple[str, Path]]:
+        i = bisect_left(files, prefix, key=lambda f: f[0])
+
+        while i < len(files) and files[i][0].startswith(prefix):
+            yield files[i]
+            i += 1
+
+
+class DirectorySnapshot:
+    """
+    Снимок дерева каталогов.
+    Создаётся одним обходом и заменяет rglob / exists / iterdir при загрузке раздела
+    """
+
+    def __init__(self, root: Path, folders: Mapping[Path, _SnapshotFolder]) -> None:
+        self.root = root
+        """Корневой каталог снимка"""
+        self.__folders = folders
+
+    @classmethod
+    def scan(cls, root: Path) -> DirectorySnapshot:
+        """
+        Обойти дерево каталогов (символические ссылки на каталоги не раскрываются, как в rglob)
+        :raises PermissionError: Нет доступа к каталогу дерева (как и при rglob, ошибки ввода-вывода передаются дальше)
+        """
+        folders = dict[Path, _SnapshotFolder]()
+        stack = [root]
+
+        while stack:
+            folder = stack.pop()
+            sub_folders = list[Path]()
+            filenames = list[str]()
+
+            try:
+                with os.scandir(folder) as it:
+                    for entry in it:
+                        if entry.is_dir():
+                            sub_folders.append(folder / entry.name)
+
+                            if not entry.is_symlink():
+                                stack.append(folder / entry.name)
+                        else:
+                            filenames.append(entry.name)
+
+            except (FileNotFoundError, NotADirectoryError):
+                # Каталог удалён во время обхода. Ошибки доступа и ввода-вывода не скрываются
+                pass
+
+            folders[folder] = _SnapshotFolder.make(folder, sub_folders, filenames)
+
+        return cls(root, folders)
+
+    def covers(self, folder: Path) -> bool:
+        """Каталог входит в снимок"""
+        return folder in self.__folders
+
+    def isFile(self, path: Path) -> bool:
+        """Файл существует (каталог файла должен входить в снимок)"""
+        return os.path.normcase(path.name) in self.__folders[path.parent].files
+
+    def subdirs(self, folder: Path) -> Sequence[Path]:
+        """Подкаталоги каталога"""
+        return self.__folders[folder].folders
+
+    def rglob(self, folder: Path, pattern: str) -> Iterable[Path]:
+        """Рекурсивный поиск файлов по шаблону имени (аналог Path.rglob)"""
+        normalized = os.path.normcase(pattern)
+        _, dot, extension = normalized.rpartition('.')
+        extension = extension if dot and _MAGIC.isdisjoint(extension) else None
+        prefix = normalized[:min((normalized.find(c) for c in _MAGIC if c in normalized), default=len(normalized))]
+
+        for entry in self._walk(folder):
+            for _, path in entry.candidates(prefix, extension):
+                if fnmatch(path.name, pattern):
+                    yield path
+
+    def _walk(self, folder: Path) -> Iterable[_SnapshotFolder]:
+        stack = [folder]
+
+        while stack:
+            entry = self.__folders.get(stack.pop())
+
+            if entry is None:
+                continue
 
-    yield from (
-        _subs(root)
-        if level == 0 else
-        chain(*map(_subs, iterDirs(root, level - 1)))
-    )
+            yield entry
+            stack.extend(reversed(entry.folders))
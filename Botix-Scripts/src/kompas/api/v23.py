@@ -0,0 +1,666 @@
+"""
+Чтение документов КОМПАС-3D v23 (.m3d, .a3d) без запуска КОМПАС.
+Документ - zip-контейнер: читается только центральный каталог и запрошенные записи
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+from typing import Callable
+from typing import ClassVar
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from xml.etree import ElementTree
+from xml.sax.saxutils import unescape
+
+
+class ContainerError(ValueError):
+    """Файл не является корректным контейнером КОМПАС"""
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ContainerEntry:
+    """Запись центрального каталога"""
+
+    name: str
+    """Имя записи"""
+    method: int
+    """Метод сжатия (0 - без сжатия, 8 - deflate)"""
+    crc32: int
+    """Контрольная сумма распакованных данных"""
+    compressed_size: int
+    """Размер сжатых данных"""
+    size: int
+    """Размер распакованных данных"""
+    header_offset: int
+    """Смещение локального заголовка"""
+
+
+class EntryStream(io.RawIOBase):
+    """Поток с произвольным доступом только для чтения поверх данных записи"""
+
+    def __init__(self, data: memoryview) -> None:
+        """
+        :param data: Данные записи
+        """
+        super().__init__()
+        self.__data = data
+        self.__position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self.__data[self.__position:self.__position + len(buffer)]
+        size = len(chunk)
+        memoryview(buffer).cast("B")[:size] = chunk
+        self.__position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.__position, io.SEEK_END: len(self.__data)}[whence]
+        self.__position = max(0, base + offset)
+        return self.__position
+
+    def tell(self) -> int:
+        return self.__position
+
+    def close(self) -> None:
+        if not self.closed:
+            self.__data.release()
+
+        super().close()
+
+
+class Container:
+    """
+    Zip-контейнер документа, открытый через mmap.
+    При открытии разбирается только центральный каталог, записи читаются по запросу
+    """
+
+    stored: ClassVar = 0
+    """Метод: без сжатия"""
+    deflated: ClassVar = 8
+    """Метод: deflate"""
+
+    _eocd = struct.Struct("<4s4H2LH")
+    _eocd64_locator = struct.Struct("<4sLQL")
+    _eocd64 = struct.Struct("<4sQ2H2L4Q")
+    _central_header = struct.Struct("<4s4B4HL2L5H2L")
+    _local_header = struct.Struct("<4s2B4HL2L2H")
+    _max_comment_size: ClassVar = 0xFFFF
+
+    def __init__(self, path: Path, buffer: Optional[memoryview] = None) -> None:
+        """
+        :param path: Путь к документу (для вложенного документа - путь к нему внутри внешнего)
+        :param buffer: Содержимое вложенного документа (None - документ открывается через mmap)
+        """
+        self.path = path
+        """Путь к документу"""
+
+        if buffer is None:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    raise ContainerError(f"{path}: пустой файл")
+
+                self.__mmap: Optional[mmap.mmap] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            buffer = memoryview(self.__mmap)
+
+        else:
+            self.__mmap = None
+
+        self.__buffer = buffer
+
+        try:
+            self.entries: Mapping[str, ContainerEntry] = self.__readCentralDirectory()
+            """Записи по имени (в порядке центрального каталога)"""
+
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            self.close()
+            raise ContainerError(f"{path}: повреждён центральный каталог ({e})") from None
+
+        except BaseException:
+            self.close()
+            raise
+
+    def read(self, name: str) -> bytes:
+        """Прочитать и распаковать запись"""
+        entry = self.entries.get(name)
+
+        if entry is None:
+            raise KeyError(f"{self.path}: нет записи {name!r}")
+
+        with self.readRaw(entry) as raw:
+            if entry.method == self.deflated:
+                try:
+                    data = zlib.decompress(raw, -zlib.MAX_WBITS, entry.size)
+
+                except zlib.error as e:
+                    raise ContainerError(f"{self.path}: {name!r} - повреждены сжатые данные ({e})") from None
+
+            elif entry.method == self.stored:
+                data = bytes(raw)
+
+            else:
+                raise ContainerError(f"{self.path}: {name!r} - неподдерживаемый метод сжатия {entry.method}")
+
+        if zlib.crc32(data) != entry.crc32:
+            raise ContainerError(f"{self.path}: {name!r} - не совпадает контрольная сумма")
+
+        return data
+
+    def readRaw(self, entry: ContainerEntry) -> memoryview:
+        """Данные записи в том виде, в каком они хранятся (без копирования; освободить до закрытия документа)"""
+        offset = entry.header_offset
+        header_end = offset + self._local_header.size
+
+        if header_end > len(self.__buffer) or self.__buffer[offset:offset + 4] != b"PK\x03\x04":
+            raise ContainerError(f"{self.path}: {entry.name!r} - повреждён локальный заголовок")
+
+        *_, name_size, extra_size = self._local_header.unpack_from(self.__buffer, offset)
+        start = header_end + name_size + extra_size
+
+        if start + entry.compressed_size > len(self.__buffer):
+            raise ContainerError(f"{self.path}: {entry.name!r} - данные записи обрезаны")
+
+        return self.__buffer[start:start + entry.compressed_size]
+
+    def getFingerprint(self) -> str:
+        """
+        Отпечаток содержимого по центральному каталогу: хэш имени, CRC-32 и размера каждой записи.
+        Данные записей не читаются
+        """
+        h = hashlib.blake2b()
+
+        for entry in self.entries.values():
+            h.update(f"{entry.name}\0{entry.crc32:08x}\0{entry.size}\n".encode("utf-8"))
+
+        return h.hexdigest()
+
+    def readText(self, name: str) -> str:
+        """Прочитать текстовую запись (UTF-16 с BOM)"""
+        try:
+            return self.read(name).decode("utf-16")
+
+        except UnicodeDecodeError as e:
+            raise ContainerError(f"{self.path}: {name!r} - повреждён текст ({e})") from None
+
+    def openEntry(self, name: str) -> BinaryIO:
+        """
+        Открыть запись как поток с произвольным доступом.
+        Несжатая запись читается прямо из отображения файла (без копирования и извлечения на диск),
+        сжатая - распаковывается в память. Поток действителен до закрытия документа
+        """
+        entry = self.entries.get(name)
+
+        if entry is None:
+            raise KeyError(f"{self.path}: нет записи {name!r}")
+
+        if entry.method == self.stored:
+            return EntryStream(self.readRaw(entry))
+
+        return io.BytesIO(self.read(name))
+
+    def openNested(self, name: str) -> Container:
+        """Открыть несжатую запись как вложенный документ (закрыть до закрытия внешнего)"""
+        entry = self.entries.get(name)
+
+        if entry is None:
+            raise KeyError(f"{self.path}: нет записи {name!r}")
+
+        if entry.method != self.stored:
+            raise ContainerError(f"{self.path}: {name!r} - вложенный документ сжат")
+
+        return Container(self.path / name, self.readRaw(entry))
+
+    def close(self) -> None:
+        """
+        Закрыть документ.
+        Если ещё существуют представления записей (readRaw, openEntry), отображение файла
+        освобождается вместе с последним из них
+        """
+        self.__buffer.release()
+
+        if self.__mmap is not None:
+            try:
+                self.__mmap.close()
+
+            except BufferError:
+                pass
+
+    def __enter__(self) -> Container:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __readCentralDirectory(self) -> Mapping[str, ContainerEntry]:
+        buffer = self.__buffer
+        eocd = len(buffer) - self._eocd.size
+
+        if eocd < 0:
+            raise ContainerError(f"{self.path}: файл слишком мал для zip-контейнера")
+
+        if buffer[eocd:eocd + 4] != b"PK\x05\x06":
+            # Запись конца каталога смещена комментарием архива
+            tail = max(0, eocd - self._max_comment_size)
+            eocd = bytes(buffer[tail:]).rfind(b"PK\x05\x06")
+
+            if eocd == -1:
+                raise ContainerError(f"{self.path}: не найден конец центрального каталога")
+
+            eocd += tail
+
+        _, _, _, _, count, directory_size, directory_offset, _ = self._eocd.unpack_from(buffer, eocd)
+
+        if count == 0xFFFF or directory_offset == 0xFFFFFFFF:
+            count, directory_offset = self.__readZip64End(eocd)
+
+        ret = dict[str, ContainerEntry]()
+        offset = directory_offset
+
+        for _ in range(count):
+            if buffer[offset:offset + 4] != b"PK\x01\x02":
+                raise ContainerError(f"{self.path}: повреждён центральный каталог")
+
+            (
+                _, _, _, _, _, flags, method, _, _, crc32, compressed_size, size,
+                name_size, extra_size, comment_size, _, _, _, header_offset
+            ) = self._central_header.unpack_from(buffer, offset)
+
+            offset += self._central_header.size
+            name = bytes(buffer[offset:offset + name_size]).decode("utf-8" if flags & 0x800 else "cp437")
+            # Копия: срез отображения, оставшийся в кадре трассировки, не дал бы закрыть документ
+            extra = bytes(buffer[offset + name_size:offset + name_size + extra_size])
+            offset += name_size + extra_size + comment_size
+
+            if flags & 0x1:
+                raise ContainerError(f"{self.path}: {name!r} - зашифрованная запись")
+
+            if 0xFFFFFFFF in (size, compressed_size, header_offset):
+                size, compressed_size, header_offset = self.__readZip64Extra(extra, size, compressed_size, header_offset)
+
+            ret[name] = ContainerEntry(
+                name=name,
+                method=method,
+                crc32=crc32,
+                compressed_size=compressed_size,
+                size=size,
+                header_offset=header_offset,
+            )
+
+        return ret
+
+    def __readZip64End(self, eocd: int) -> tuple[int, int]:
+        locator = eocd - self._eocd64_locator.size
+
+        if locator < 0 or self.__buffer[locator:locator + 4] != b"PK\x06\x07":
+            raise ContainerError(f"{self.path}: не найден указатель zip64")
+
+        _, _, offset, _ = self._eocd64_locator.unpack_from(self.__buffer, locator)
+
+        if self.__buffer[offset:offset + 4] != b"PK\x06\x06":
+            raise ContainerError(f"{self.path}: повреждён конец центрального каталога zip64")
+
+        *_, count, _, directory_offset = self._eocd64.unpack_from(self.__buffer, offset)
+        return count, directory_offset
+
+    @staticmethod
+    def __readZip64Extra(extra: bytes, size: int, compressed_size: int, header_offset: int) -> tuple[int, int, int]:
+        # Поля zip64 присутствуют только для значений 0xFFFFFFFF и идут в фиксированном порядке
+        offset = 0
+
+        while offset + 4 <= len(extra):
+            tag, length = struct.unpack_from("<2H", extra, offset)
+            offset += 4
+
+            if tag == 0x0001:
+                values = iter(struct.unpack_from(f"<{length // 8}Q", extra, offset))
+
+                if size == 0xFFFFFFFF:
+                    size = next(values)
+
+                if compressed_size == 0xFFFFFFFF:
+                    compressed_size = next(values)
+
+                if header_offset == 0xFFFFFFFF:
+                    header_offset = next(values)
+
+                break
+
+            offset += length
+
+        return size, compressed_size, header_offset
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class FileInfo:
+    """Сведения о приложении, сохранившем документ (запись FileInfo)"""
+
+    entry_name: ClassVar = "FileInfo"
+    date_format: ClassVar = "%d.%m.%Y %H:%M:%S"
+
+    app_name: str
+    """Название приложения ('КОМПАС-3D v23 Учебная версия')"""
+    app_version: str
+    """Версия приложения ('KOMPAS_23.0')"""
+    build_number: str
+    """Номер сборки ('2182_revK_1_revM_118030')"""
+    full_version: str
+    """Полная версия ('23.0.1.2182')"""
+    file_type_name: str
+    """Тип документа ('Kompas.m3d')"""
+    file_type: int
+    """Код типа документа"""
+    create_date: Optional[datetime]
+    """Дата создания"""
+    modify_date: Optional[datetime]
+    """Дата изменения"""
+
+    @classmethod
+    def parse(cls, data: bytes) -> FileInfo:
+        """Разобрать запись"""
+        values = dict[str, str]()
+
+        for line in data.decode("utf-16").splitlines():
+            key, separator, value = line.partition('=')
+
+            if separator:
+                values[key.strip()] = value.strip()
+
+        return cls(
+            app_name=values.get("AppName", ""),
+            app_version=values.get("AppVersion", ""),
+            build_number=values.get("BuildNum", ""),
+            full_version=values.get("AppFullVersion", ""),
+            file_type_name=values.get("FileTypeName", ""),
+            file_type=int(values.get("FileType", "0")),
+            create_date=cls._parseDate(values.get("CreateData")),
+            modify_date=cls._parseDate(values.get("ModifyData")),
+        )
+
+    @classmethod
+    def _parseDate(cls, value: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
+
+        try:
+            return datetime.strptime(value, cls.date_format)
+
+        except ValueError:
+            return None
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ProductObject:
+    """Объект состава изделия (тело, компонент, исполнение)"""
+
+    type: str
+    """Тип объекта ('body', 'component', 'embodiment')"""
+    grouped: bool
+    """Объект - группа одинаковых объектов"""
+    name: str
+    """Наименование"""
+    mass: Optional[float]
+    """Масса, кг"""
+    material: Optional[str]
+    """Материал"""
+    count: Optional[int]
+    """Количество"""
+    full_file_name: Optional[str]
+    """Файл источника ('>Имя.m3d' - локальная деталь)"""
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ProductInfo:
+    """Метаданные изделия (запись MetaProductInfo)"""
+
+    entry_name: ClassVar = "MetaProductInfo"
+
+    version: str
+    """Версия формата метаданных"""
+    revision: int
+    """Ревизия метаданных"""
+    author: Optional[str]
+    """Автор документа"""
+    full_file_name: Optional[str]
+    """Полный путь к документу на момент сохранения"""
+    objects: Sequence[ProductObject]
+    """Объекты состава изделия"""
+
+    @classmethod
+    def parse(cls, data: bytes) -> ProductInfo:
+        """Разобрать запись"""
+        root = ElementTree.fromstring(data)
+        product = root.find("product")
+        document = None if product is None else product.find("document")
+
+        return cls(
+            version=root.get("version", ""),
+            revision=int(root.get("revision", "0")),
+            author=cls._getValue(document, "author"),
+            full_file_name=cls._getValue(document, "fullFileName"),
+            objects=tuple(
+                cls._parseObject(element)
+                for element in (() if product is None else product)
+                if element.tag in ("infObject", "groupInfObject")
+            ),
+        )
+
+    @classmethod
+    def _parseObject(cls, element: ElementTree.Element) -> ProductObject:
+        mass = cls._getValue(element, "mass")
+        count = cls._getValue(element.find("ownerEmbodiment"), "count")
+
+        return ProductObject(
+            type=element.get("type", ""),
+            grouped=element.tag == "groupInfObject",
+            name=cls._getValue(element, "name") or "",
+            mass=None if mass is None else float(mass),
+            material=cls._getValue(element.find("property[@id='material']"), "name"),
+            count=None if count is None else int(count),
+            full_file_name=cls._getValue(element.find("document"), "fullFileName"),
+        )
+
+    @staticmethod
+    def _getValue(element: Optional[ElementTree.Element], property_id: str) -> Optional[str]:
+        """Значение дочернего свойства (None - свойство отсутствует или пусто)"""
+        if element is None:
+            return None
+
+        child = element.find(f"property[@id='{property_id}']")
+        return None if child is None else child.get("value") or None
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class SourceInfo:
+    """Источник компонента сборки (элемент записи Sources)"""
+
+    entry_name: ClassVar = "Sources"
+    embedded_delimiter: ClassVar = '>'
+    """Разделитель имени локальной детали ('>Деталь (локальная).m3d')"""
+
+    _path_pattern: ClassVar = re.compile(r"<path>(.*?)</path>", re.DOTALL)
+
+    path: str
+    """Путь к файлу источника, как он записан в документе (относительно каталога документа)"""
+
+    def isEmbedded(self) -> bool:
+        """Источник - локальная деталь, хранящаяся внутри документа"""
+        return self.embedded_delimiter in self.path
+
+    @classmethod
+    def parseAll(cls, data: bytes) -> Sequence[SourceInfo]:
+        """
+        Разобрать запись.
+        Запись - последовательность корневых элементов, а имена части тегов начинаются с цифры ('<3d_geom>'):
+        XML-разбор неприменим, извлекаются только пути
+        """
+        return tuple(
+            cls(path=unescape(path.strip()))
+            for path in cls._path_pattern.findall(data.decode("utf-16"))
+        )
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ResourceInfo:
+    """Ресурс, хранящийся внутри документа (элемент записи resourcesInfo)"""
+
+    entry_name: ClassVar = "resourcesInfo"
+
+    name: str
+    """Имя ресурса ('>Деталь (локальная).m3d')"""
+    hash: str
+    """Хэш содержимого ресурса"""
+    type: str
+    """Тип ресурса ('detail')"""
+
+    @classmethod
+    def parseAll(cls, data: bytes) -> Sequence[ResourceInfo]:
+        """Разобрать запись"""
+        return tuple(
+            cls(name=element.get("name", ""), hash=element.get("hash", ""), type=element.get("type", ""))
+            for element in ElementTree.fromstring(data).iter("resource")
+        )
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class DocumentLinks:
+    """Связи документа с другими файлами и вложенными ресурсами"""
+
+    sources: Sequence[SourceInfo]
+    """Источники компонентов (пусто, если записи нет)"""
+    resources: Sequence[ResourceInfo]
+    """Вложенные ресурсы (пусто, если записи нет)"""
+
+    @classmethod
+    def read(cls, container: Container) -> DocumentLinks:
+        """Прочитать записи Sources и resourcesInfo"""
+        has_sources = SourceInfo.entry_name in container.entries
+        has_resources = ResourceInfo.entry_name in container.entries
+
+        return cls(
+            sources=SourceInfo.parseAll(container.read(SourceInfo.entry_name)) if has_sources else (),
+            resources=ResourceInfo.parseAll(container.read(ResourceInfo.entry_name)) if has_resources else (),
+        )
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class EmbeddedPart:
+    """Локальная деталь, хранящаяся внутри документа сборки"""
+
+    folder_prefix: ClassVar = "details\\"
+    """Префикс имён записей локальных деталей"""
+
+    entry_name: str
+    """Имя записи ('details\\>Деталь (локальная) 1.m3d')"""
+    name: str
+    """Имя ресурса ('>Деталь (локальная) 1.m3d')"""
+    size: int
+    """Размер документа детали"""
+    crc32: int
+    """Контрольная сумма документа детали"""
+    hash: Optional[str]
+    """Хэш ресурса из resourcesInfo (None - ресурс не описан)"""
+
+    def getDisplayName(self) -> str:
+        """Имя детали без владельца и расширения ('Деталь (локальная) 1')"""
+        return Path(self.name.rpartition(SourceInfo.embedded_delimiter)[2]).stem
+
+    @classmethod
+    def readAll(cls, container: Container) -> Sequence[EmbeddedPart]:
+        """Локальные детали документа по центральному каталогу и записи resourcesInfo (детали не открываются)"""
+        hashes = {
+            resource.name: resource.hash
+            for resource in DocumentLinks.read(container).resources
+        }
+
+        return tuple(
+            cls(
+                entry_name=entry.name,
+                name=(name := entry.name[len(cls.folder_prefix):]),
+                size=entry.size,
+                crc32=entry.crc32,
+                hash=hashes.get(name),
+            )
+            for entry in container.entries.values()
+            if entry.name.startswith(cls.folder_prefix) and entry.size > 0
+        )
+
+
+class DocumentReader:
+    """
+    Чтение сведений из документов с кэшем.
+    Результаты запоминаются для файла до изменения его размера или времени изменения
+    """
+
+    def __init__(self) -> None:
+        self.__cache = dict[tuple[Path, str], tuple[tuple[int, int], object]]()
+        self.__lock = threading.Lock()
+
+    def getFileInfo(self, path: Path) -> FileInfo:
+        """Сведения о приложении"""
+        return self._get(path, FileInfo.entry_name, lambda c: FileInfo.parse(c.read(FileInfo.entry_name)))
+
+    def getProductInfo(self, path: Path) -> ProductInfo:
+        """Метаданные изделия"""
+        return self._get(path, ProductInfo.entry_name, lambda c: ProductInfo.parse(c.read(ProductInfo.entry_name)))
+
+    def getLinks(self, path: Path) -> DocumentLinks:
+        """Источники компонентов и вложенные ресурсы (документ открывается один раз)"""
+        return self._get(path, DocumentLinks.__name__, DocumentLinks.read)
+
+    def getEmbeddedParts(self, path: Path) -> Sequence[EmbeddedPart]:
+        """Локальные детали документа сборки"""
+        return self._get(path, EmbeddedPart.__name__, EmbeddedPart.readAll)
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Сбросить кэш документа (None - всех документов)"""
+        with self.__lock:
+            for key in tuple(self.__cache):
+                if path is None or key[0] == path:
+                    del self.__cache[key]
+
+    def _get[T](self, path: Path, name: str, read: Callable[[Container], T]) -> T:
+        """Сведения документа из кэша или из файла"""
+        stat = os.stat(path)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        key = (path, name)
+
+        with self.__lock:
+            cached = self.__cache.get(key)
+
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        with Container(path) as container:
+            try:
+                ret = read(container)
+
+            except (UnicodeDecodeError, ElementTree.ParseError) as e:
+                raise ContainerError(f"{path}: повреждена запись {name!r} ({e})") from None
+
+        with self.__lock:
+            self.__cache[key] = (stamp, ret)
+
+        return ret
+
+
+default_reader = DocumentReader()
+"""Общий экземпляр чтения документов"""
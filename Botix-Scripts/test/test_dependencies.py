@@ -0,0 +1,60 @@
+import tempfile
+import zipfile
+from pathlib import Path
+
+from botix.impl.dependencies import DependencyGraph
+from kompas.api.v23 import DocumentReader
+
+
+def _writeAssembly(path: Path, sources: tuple[str, ...]) -> None:
+    text = '<?xml version="1.0" encoding="utf-16"?>\n' + ''.join(
+        f"<source>\n\t<path>{source}</path>\n\t<embPath/>\n</source>\n"
+        for source in sources
+    )
+    resources = '<?xml version="1.0"?>\n<resources>\n\t<resource name=">Local.m3d" hash="AB" type="detail" />\n</resources>'
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as z:
+        z.writestr("Sources", text.encode("utf-16"))
+        z.writestr("resourcesInfo", resources.encode("utf-16"))
+
+
+root = Path(tempfile.mkdtemp()) / "Модели"
+
+(root / "Parts" / "A").mkdir(parents=True)
+(root / "Parts" / "A" / ".m3d").touch()
+(root / "Parts" / "B.m3d").touch()
+
+_writeAssembly(root / "Units" / "U1" / ".a3d", (
+    r"..\..\Parts\A\.m3d",
+    r"..\..\Renamed\C.m3d",
+    r"A:\Other\D.m3d",
+))
+_writeAssembly(root / "Units" / "U2" / ".a3d", (
+    r"..\U1\.a3d",
+    r"..\..\Parts\B.m3d",
+))
+(root / "Units" / "Broken").mkdir()
+(root / "Units" / "Broken" / ".a3d").write_bytes(b"PK\x03\x04 truncated")
+
+u1 = root / "Units" / "U1" / ".a3d"
+u2 = root / "Units" / "U2" / ".a3d"
+broken = root / "Units" / "Broken" / ".a3d"
+a = root / "Parts" / "A" / ".m3d"
+
+graph = DependencyGraph.build(root, workers=2, reader=DocumentReader())
+
+assert set(graph.getAssemblies()) == {u1, u2}
+assert graph.getDependencies(u1) == (a,)
+assert graph.getDependencies(u2) == (u1, root / "Parts" / "B.m3d")
+assert graph.getDependents(a) == (u1,)
+assert graph.getAffected(a) == [u1, u2]
+assert [r.name for r in graph.getResources(u1)] == [">Local.m3d"]
+print(f"affected: {graph.getAffected(a)}")
+
+assert graph.unresolved == {u1: (r"..\..\Renamed\C.m3d", r"A:\Other\D.m3d")}, graph.unresolved
+print(f"unresolved: {graph.unresolved}")
+
+assert set(graph.failed) == {broken}, graph.failed
+print(f"failed: {graph.failed}")
@@ -0,0 +1,111 @@
+import gc
+import pickle
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+from botix.core import compact
+from botix.core.entities import MetadataEntity
+from botix.core.entities import PartEntity
+from botix.core.entities import UnitEntity
+
+
+@dataclass(frozen=True, kw_only=True)
+class _DictMetadataEntity:
+    """Прежнее представление метаданных (без слотов, полные пути)"""
+
+    path: Path
+    words: Sequence[str]
+    version: int
+    images: Sequence[Path]
+
+
+@dataclass(frozen=True, kw_only=True)
+class _DictPartEntity:
+    metadata: _DictMetadataEntity
+    transitions: Sequence[Path]
+
+
+@dataclass(frozen=True, kw_only=True)
+class _DictUnitEntity:
+    metadata: _DictMetadataEntity
+    transition_assembly: Optional[Path]
+    parts: Sequence[_DictPartEntity]
+    attributes: None
+
+
+def _makeCatalog(metadata_type: Callable, part_type: Callable, unit_type: Callable) -> list:
+    root = Path("/") / "Модели" / "Шасси"
+    units = list()
+
+    for product in range(50):
+        for variant in range(1, 6):
+            folder = root / f"Изделие-{product}" / f"Вариант-v{variant}"
+            parts = tuple(
+                part_type(
+                    metadata=metadata_type(
+                        path=folder / f"Деталь-{part}-v1.m3d",
+                        words=f"Деталь-{part}".split('-'),
+                        version=1,
+                        images=(folder / f"Деталь-{part}-v1.png",),
+                    ),
+                    transitions=(folder / f"Деталь-{part}-v1.stl", folder / f"Деталь-{part}-v1.prusa.3mf"),
+                )
+                for part in range(40)
+            )
+            units.append(unit_type(
+                metadata=metadata_type(
+                    path=folder,
+                    words=("Изделие", f"{product}", "Вариант"),
+                    version=variant,
+                    images=(folder / f"Изделие-{product}-Вариант-v{variant}-0.png",),
+                ),
+                transition_assembly=folder / f"Изделие-{product}-Вариант-v{variant}.stp",
+                parts=parts,
+                attributes=None,
+            ))
+
+    return units
+
+
+def _measure(name: str, make: Callable[[], list]) -> int:
+    tracemalloc.start()
+    catalog = make()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name}: {size / 1024 / 1024:.2f} MiB ({len(catalog)} units)")
+    return size
+
+
+def _checkInterning() -> None:
+    """Общие каталоги разделяются сущностями и освобождаются вместе с ними"""
+    gc.collect()
+    initial = len(compact._folders)
+
+    catalog = _makeCatalog(MetadataEntity, PartEntity, UnitEntity)
+    part = catalog[0].parts[0]
+    assert part.metadata._path.folder is part._transitions[0].folder
+    assert type(part.metadata.path) is type(Path())
+
+    restored = pickle.loads(pickle.dumps(catalog))
+    assert restored[0].parts[0].metadata._path.folder is part.metadata._path.folder
+    assert len(compact._folders) > initial
+
+    del catalog, part, restored
+    gc.collect()
+    assert len(compact._folders) == initial
+    print("interning: ok")
+
+
+def _main() -> None:
+    _checkInterning()
+    before = _measure("dict", lambda: _makeCatalog(_DictMetadataEntity, _DictPartEntity, _DictUnitEntity))
+    after = _measure("slots", lambda: _makeCatalog(MetadataEntity, PartEntity, UnitEntity))
+    print(f"ratio: {after / before:.2f}")
+
+
+if __name__ == "__main__":
+    _main()
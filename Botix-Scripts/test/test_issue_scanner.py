@@ -2,12 +2,12 @@ import sys
 from pathlib import Path
 
 from engines.text import FormatTextIOAdapter
-from botix.impl.loaders import ProjectEntityLoader
+from botix.impl.snapshot import ProjectEntitySnapshot
 from botix.impl.visitor.scanner.issue import IssueScannerEntityVisitor
 
 path = Path(r"/Модели")
 
-p = ProjectEntityLoader(path).load()
+p = ProjectEntitySnapshot(path).load()
 
 v = IssueScannerEntityVisitor()
 v.visitProjectEntity(p)
@@ -0,0 +1,68 @@
+import tempfile
+from pathlib import Path
+
+from kompas.api.v23 import Container
+from kompas.api.v23 import ContainerError
+from kompas.api.v23 import DocumentReader
+from kompas.api.v23 import EmbeddedPart
+from kompas.api.v23 import FileInfo
+
+path = Path(__file__).resolve().parents[2] / "Models" / "Boards" / "Voltage-Converters" / "LM2596" / ".a3d"
+reader = DocumentReader()
+
+# Сведения документа
+
+file_info = reader.getFileInfo(path)
+assert file_info.file_type_name == "Kompas.a3d", file_info
+assert file_info.app_version == "KOMPAS_23.0"
+assert file_info.create_date is not None and file_info.modify_date is not None
+assert file_info.create_date < file_info.modify_date
+print(f"file info: {file_info}")
+
+product_info = reader.getProductInfo(path)
+assert product_info.full_file_name.endswith("LM2596\\.a3d"), product_info.full_file_name
+assert len(product_info.objects) > 0
+assert reader.getProductInfo(path) is product_info
+print(f"product info: {product_info.version}, {len(product_info.objects)} objects")
+
+# Локальные детали и вложенные документы
+
+with Container(path) as container:
+    parts = EmbeddedPart.readAll(container)
+
+    assert len(parts) == 5, parts
+    assert all(part.entry_name == EmbeddedPart.folder_prefix + part.name for part in parts)
+    assert all(part.hash is not None for part in parts)
+    assert parts[0].getDisplayName() == "Деталь (локальная) 1 1", parts[0].getDisplayName()
+
+    with container.openNested(parts[0].entry_name) as nested:
+        nested_info = FileInfo.parse(nested.read(FileInfo.entry_name))
+
+    assert nested_info.file_type_name == "Kompas.m3d", nested_info
+    assert reader.getEmbeddedParts(path) == parts
+
+    try:
+        container.openNested("missing")
+        raise AssertionError("missing entry opened")
+
+    except KeyError as e:
+        print(f"missing: {e}")
+
+print(f"embedded parts: {[part.getDisplayName() for part in parts]}")
+
+# Повреждённые документы
+
+data = path.read_bytes()
+damaged = Path(tempfile.mkdtemp())
+
+(damaged / "truncated.a3d").write_bytes(data[:len(data) // 2])
+(damaged / "no-directory.a3d").write_bytes(data[:-30])
+(damaged / "empty.a3d").write_bytes(b"")
+
+for p in sorted(damaged.iterdir()):
+    try:
+        reader.getFileInfo(p)
+        raise AssertionError(f"{p.name} read")
+
+    except ContainerError as e:
+        print(f"{p.name}: {e}")
@@ -11,7 +11,7 @@ from botix.core.key import UnitKey
 from botix.core.registries import PartEntityRegistry
 from botix.core.registries import PartsSectionRegistry
 from botix.core.registries import UnitEntityRegistry
-from botix.impl.loaders import ProjectEntityLoader
+from botix.impl.snapshot import ProjectEntitySnapshot
 
 
 def _link(s: str, path: str) -> str:
@@ -188,7 +188,7 @@ def _main() -> None:
     root = Path("/")
     output_folder = root / "Производство"
 
-    project = ProjectEntityLoader(root / "Модели").load()
+    project = ProjectEntitySnapshot(root / "Модели").load()
     units = UnitEntityRegistry(project)
     parts = PartsSectionRegistry(project)
 
@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+
+from engines.text import FormatTextIOAdapter
+from botix.impl.snapshot import ProjectEntitySnapshot
+from botix.impl.visitor.render.text import TextRenderEntityVisitor
+from botix.impl.visitor.scanner.issue import IssueScannerEntityVisitor
+from botix.impl.visitor.scanner.statistics import StatisticsEntityVisitor
+from botix.impl.visitor.traversal import TraversalEngine
+
+path = Path(r"/Модели")
+
+p = ProjectEntitySnapshot(path).load()
+
+out = FormatTextIOAdapter(sys.stdout)
+issues = IssueScannerEntityVisitor()
+statistics = StatisticsEntityVisitor()
+
+TraversalEngine((TextRenderEntityVisitor(out), issues, statistics)).run(p)
+
+issues.write(out)
+statistics.write(out)
@@ -0,0 +1,36 @@
+from botix.core.entities import MetadataEntity
+from botix.core.versions import VersionIndex
+
+# Разбор имени
+
+assert MetadataEntity.parseName("Стенка-Задняя-v2") == (["Стенка", "Задняя"], 2)
+assert MetadataEntity.parseName("Стенка-Задняя") == (["Стенка", "Задняя"], None)
+assert MetadataEntity.parseName("Клапан-Valve") == (["Клапан", "Valve"], None)
+assert MetadataEntity.parseName("v2") == ([], 2)
+print("parseName: ok")
+
+# Индекс версий
+
+index = VersionIndex.ofKeys({
+    "Шасси/Стенка-v1": "s1",
+    "Шасси/Стенка-v3": "s3",
+    "Шасси/Стенка-v2": "s2",
+    "Шасси/Крышка-v5": "k5",
+    "Шасси/Без-Версии": "none",
+})
+
+assert "Шасси/Стенка" in index
+assert "Шасси/Без-Версии" not in index
+assert index.getVersions("Шасси/Стенка") == (1, 2, 3)
+
+assert index.resolve("Шасси/Стенка-v2") == "s2"
+assert index.resolve("Шасси/Стенка") == "s3"
+assert index.resolve("Шасси/Стенка-v4") is None
+assert index.resolve("Шасси/Крышка") == "k5"
+assert index.resolve("Шасси/Нет") is None
+
+assert index.getRange("Шасси/Стенка", 2, 3) == ("s2", "s3")
+assert index.getRange("Шасси/Стенка", 0, 10) == ("s1", "s2", "s3")
+assert index.getRange("Шасси/Стенка", 4, 10) == ()
+assert index.getRange("Шасси/Нет", 0, 10) == ()
+print("VersionIndex: ok")
@@ -1,6 +1,22 @@
+from scaffold._archive import ReleaseArchiveWriter
+from scaffold._blobs import BlobStore
 from scaffold._config import Config
+from scaffold._fingerprint import FingerprintService
 from scaffold._jobs import ModelInfoJob, Job, MakeArtifactsJob
+from scaffold._jobs import ArtifactsReport
+from scaffold._jobs import BatchArtifactsJob
+from scaffold._jobs import BatchArtifactsResult
+from scaffold._loader import ParallelLoader
+from scaffold._manifest import ArtifactsManifest
+from scaffold._manifest import ManifestEntry
 from scaffold._models import AssemblyUnitModel
+from scaffold._models import EmbeddedPartModel
+from scaffold._models import LazyModelMapping
 from scaffold._models import Model
 from scaffold._models import PartModel
 from scaffold._project import Project
+from scaffold._registry import Registry
+from scaffold._registry import RegistryStatistics
+from scaffold._snapshot import DirectoryIndex
+from scaffold._snapshot import DirectorySnapshot
+from scaffold._store import IndexStore
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Final
+from typing import Optional
+from zipfile import ZIP_DEFLATED
+from zipfile import ZIP_STORED
+from zipfile import ZipFile
+
+
+class ReleaseArchiveWriter:
+    """
+    Потоковая запись zip архива выпуска.
+    Записи читаются напрямую из исходных файлов, без промежуточной копии.
+    Архив записывается во временный файл и заменяет целевой при закрытии
+    """
+
+    stored_extensions: Final = frozenset((
+        "3mf",
+        "png",
+        "jpg",
+        "jpeg",
+        "m3d",
+        "a3d",
+        "zip",
+    ))
+    """Расширения уже сжатых форматов (записываются без повторного сжатия)"""
+
+    def __init__(self, path: Path) -> None:
+        """
+        :param path: Путь к создаваемому архиву
+        """
+        self.path: Final = path
+        """Путь к архиву"""
+
+        self._temporary_path: Final = path.with_name(f".{path.name}.tmp")
+        self._zip: Final = ZipFile(self._temporary_path, "w", compression=ZIP_DEFLATED)
+        self._names: Final = set[str]()
+
+    @classmethod
+    def compression_for(cls, source: Path) -> int:
+        """Метод сжатия для исходного файла"""
+        extension = source.name.rpartition('.')[2].lower()
+        return ZIP_STORED if extension in cls.stored_extensions else ZIP_DEFLATED
+
+    def write_file(self, source: Path, name: str) -> None:
+        """Записать исходный файл под данным именем"""
+        self._reserve(name)
+        self._zip.write(source, name, compress_type=self.compression_for(source))
+
+    def write_text(self, name: str, text: str) -> None:
+        """Записать текст (UTF-8) под данным именем"""
+        self._reserve(name)
+        self._zip.writestr(name, text.encode("utf-8"))
+
+    def _reserve(self, name: str) -> None:
+        if name in self._names:
+            raise ValueError(f"Duplicate archive entry: {name}")
+
+        self._names.add(name)
+
+    def close(self, exc: Optional[BaseException] = None) -> None:
+        """Завершить запись архива (при ошибке временный файл удаляется)"""
+        self._zip.close()
+
+        if exc is None:
+            os.replace(self._temporary_path, self.path)
+        else:
+            self._temporary_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> ReleaseArchiveWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close(exc_val)
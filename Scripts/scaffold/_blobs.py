@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from threading import Lock
+from typing import Final
+from typing import Optional
+
+from scaffold._manifest import ArtifactsManifest
+
+
+class BlobStore:
+    """
+    Хранилище содержимого файлов артефактов по хэшу (BLAKE2b).
+    Одинаковое содержимое хранится один раз, выходные файлы - жёсткие ссылки на него.
+    Содержимое, на которое не осталось ссылок, удаляется только вызовом prune
+    """
+
+    def __init__(self, root: Path) -> None:
+        """
+        :param root: Директория хранилища
+        """
+        self.root: Final = root
+        """Директория хранилища"""
+
+        self._digests: Final = dict[Path, tuple[tuple[int, int], str]]()
+        self._lock: Final = Lock()
+
+    def path_for(self, digest: str) -> Path:
+        """Путь к содержимому с данным хэшем"""
+        return self.root / digest[:2] / digest
+
+    def put(self, source: Path, digest: Optional[str] = None) -> tuple[str, bool]:
+        """
+        Поместить содержимое файла в хранилище.
+        Сначала вычисляется хэш (запоминается по размеру и времени изменения файла),
+        копирование выполняется только для содержимого, которого ещё нет в хранилище
+        :param source: Исходный файл
+        :param digest: Известный хэш содержимого (из манифеста) - если содержимое уже в хранилище, файл не читается
+        :return: Хэш содержимого и признак того, что содержимое было записано
+        """
+        stat = source.stat()
+        stamp = (stat.st_size, stat.st_mtime_ns)
+
+        if digest is None:
+            digest = self._cached_digest(source, stamp)
+
+        if digest is None:
+            digest = ArtifactsManifest.digest_file(source)
+
+        if self.path_for(digest).is_file():
+            self._remember(source, stamp, digest)
+            return digest, False
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=self.root, prefix=".", suffix=".tmp")
+        os.close(fd)
+
+        try:
+            digest = ArtifactsManifest.copy_file(source, Path(temporary))
+            self._remember(source, stamp, digest)
+            blob = self.path_for(digest)
+
+            if blob.is_file():
+                return digest, False
+
+            blob.parent.mkdir(exist_ok=True)
+            os.replace(temporary, blob)
+            return digest, True
+
+        finally:
+            Path(temporary).unlink(missing_ok=True)
+
+    def prune(self) -> tuple[int, int]:
+        """
+        Удалить содержимое, на которое не ссылается ни один выходной файл (единственная жёсткая ссылка),
+        и оставшиеся временные файлы.
+        Если файловая система не поддерживает жёсткие ссылки, удаляется всё содержимое - оно будет записано заново
+        :return: Количество и суммарный размер удалённых файлов
+        """
+        removed_files = 0
+        removed_bytes = 0
+
+        if not self.root.is_dir():
+            return removed_files, removed_bytes
+
+        for path in tuple(self.root.glob(".*.tmp")) + tuple(self.root.glob("*/*")):
+            stat = path.stat()
+
+            if path.suffix == ".tmp" or stat.st_nlink == 1:
+                path.unlink(missing_ok=True)
+                removed_files += 1
+                removed_bytes += stat.st_size
+
+        for folder in self.root.iterdir():
+            if folder.is_dir() and not any(folder.iterdir()):
+                folder.rmdir()
+
+        with self._lock:
+            self._digests.clear()
+
+        return removed_files, removed_bytes
+
+    def link(self, digest: str, destination: Path) -> None:
+        """
+        Создать выходной файл с содержимым из хранилища.
+        Жёсткая ссылка, иначе копирование средствами ядра (copy_file_range), иначе обычное копирование
+        """
+        blob = self.path_for(digest)
+        destination.unlink(missing_ok=True)
+
+        try:
+            os.link(blob, destination)
+            return
+
+        except OSError:
+            pass
+
+        if hasattr(os, "copy_file_range"):
+            try:
+                self._copy_file_range(blob, destination)
+                return
+
+            except OSError:
+                pass
+
+        shutil.copyfile(blob, destination)
+
+    def _cached_digest(self, source: Path, stamp: tuple[int, int]) -> Optional[str]:
+        with self._lock:
+            cached = self._digests.get(source)
+
+        if cached is None or cached[0] != stamp:
+            return None
+
+        return cached[1]
+
+    def _remember(self, source: Path, stamp: tuple[int, int], digest: str) -> None:
+        with self._lock:
+            self._digests[source] = (stamp, digest)
+
+    @staticmethod
+    def _copy_file_range(source: Path, destination: Path) -> None:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            remaining = os.fstat(src.fileno()).st_size
+
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+
+                if copied == 0:
+                    break
+
+                remaining -= copied
@@ -1,9 +1,16 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
+from dataclasses import field
 from pathlib import Path
 from typing import Iterable, Optional
 from typing import Iterator
 from typing import Sequence
 
+from scaffold._fingerprint import FingerprintService
+from scaffold._snapshot import DirectoryIndex
+from scaffold._store import IndexStore
+
 
 @dataclass(frozen=True, kw_only=True)
 class Config:
@@ -32,15 +39,29 @@ class Config:
     model_render_extensions: Sequence[str]
     """Расширения файлов рендеров модели"""
 
+    directory_index: DirectoryIndex = field(default_factory=DirectoryIndex, compare=False, repr=False)
+    """Снимки директорий, через которые выполняется поиск файлов"""
+
+    fingerprints: FingerprintService = field(default_factory=FingerprintService, compare=False, repr=False)
+    """Отпечатки файлов моделей для обнаружения изменений"""
+
     @classmethod
     def default(
             cls,
-            root_directory: Path
+            root_directory: Path,
+            persistent_index: bool = False,
     ):
-        """Настройки по умолчанию"""
+        """
+        Настройки по умолчанию
+        :param root_directory: Корневая директория проекта
+        :param persistent_index: Хранить индекс директорий в директории артефактов между запусками
+        """
+        artifacts_directory = root_directory / "Artifacts"
+
         return cls(
             models_directory=root_directory / "Models",
-            artifacts_directory=root_directory / "Artifacts",
+            artifacts_directory=artifacts_directory,
+            directory_index=DirectoryIndex(IndexStore.in_directory(artifacts_directory) if persistent_index else None),
             part_model_extension="m3d",
             assembly_unit_model_extension="a3d",
             assembly_unit_model_export_settings_extension="export",
@@ -59,28 +80,42 @@ class Config:
             )
         )
 
-    @staticmethod
-    def search_by_masks_recursive(root_folder: Path, masks: Iterable[str]) -> Iterator[Path]:
+    def close(self) -> None:
+        """Закрыть персистентный индекс директорий"""
+        self.directory_index.close()
+
+    def __enter__(self) -> Config:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def search_by_masks_recursive(self, root_folder: Path, masks: Iterable[str]) -> Iterator[Path]:
         """Yield files in folder (recursively) matching any of the provided glob masks."""
         for mask in masks:
-            yield from root_folder.rglob(mask)
+            for snapshot in self.directory_index.walk(root_folder):
+                yield from snapshot.match(mask)
 
-    @staticmethod
-    def search_by_masks(target_folder: Path, masks: Iterable[str]) -> Iterator[Path]:
+    def search_by_masks(self, target_folder: Path, masks: Iterable[str]) -> Iterator[Path]:
         """Yield files in target folder matching any of the provided glob masks"""
+        snapshot = self.directory_index.get(target_folder)
+
         for mask in masks:
-            yield from target_folder.glob(mask)
+            yield from snapshot.match(mask)
 
-    @staticmethod
-    def iter_folders_contains_file_with_mask(folder: Path, mask: str) -> Iterator[Path]:
+    def iter_folders_contains_file_with_mask(self, folder: Path, mask: str) -> Iterator[Path]:
         """Yields folders from folder если данный folder содержит файл подходящий по mask"""
-        if not folder.is_dir():
-            raise NotADirectoryError(folder)
+        for entry in self.directory_index.get(folder).folders:
+            if self.directory_index.get(entry).match(mask):
+                yield entry
+
+    def contains_file(self, folder: Path, filename: str) -> bool:
+        """Директория содержит файл с данным именем"""
+        try:
+            return self.directory_index.get(folder).has_file(filename)
 
-        for entry in folder.iterdir():
-            if entry.is_dir():
-                if any(entry.glob(mask)):
-                    yield entry
+        except NotADirectoryError:
+            return False
 
     def get_identifier_from_dir(self, dir: Path) -> str:
         return dir.relative_to(self.models_directory).__str__().replace('/', '.')
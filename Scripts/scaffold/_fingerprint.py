@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import zipfile
+from pathlib import Path
+from threading import Lock
+from typing import Final
+from typing import Iterable
+from typing import Optional
+
+from scaffold._manifest import ArtifactsManifest
+
+
+class FingerprintService:
+    """
+    Отпечатки содержимого файлов моделей для обнаружения изменений.
+    Для zip-контейнеров (.m3d, .a3d, .3mf) отпечаток вычисляется по центральному каталогу
+    (имя, CRC-32 и размер каждой записи) без чтения данных, для остальных файлов - BLAKE2b содержимого.
+    Отпечатки запоминаются до изменения inode, размера или времени изменения файла
+    """
+
+    zip_prefix: Final = "zip:"
+    """Префикс отпечатка zip-контейнера"""
+
+    content_prefix: Final = "blake2b:"
+    """Префикс отпечатка по содержимому"""
+
+    def __init__(self) -> None:
+        self._cache: Final = dict[Path, tuple[tuple[int, int, int], str]]()
+        self._lock: Final = Lock()
+
+    def get(self, path: Path) -> str:
+        """Получить отпечаток файла"""
+        stat = os.stat(path)
+        stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            cached = self._cache.get(path)
+
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        ret = self.compute(path)
+
+        with self._lock:
+            self._cache[path] = (stamp, ret)
+
+        return ret
+
+    @classmethod
+    def compute(cls, path: Path) -> str:
+        """Вычислить отпечаток файла без кэша"""
+        try:
+            with zipfile.ZipFile(path) as archive:
+                infos = archive.infolist()
+
+            # zipfile допускает данные перед архивом: в обрезанном документе он находит
+            # центральный каталог вложенной детали. Такой файл считается повреждённым
+            if infos and min(info.header_offset for info in infos) != 0:
+                raise zipfile.BadZipFile(f"{path}: data before the first entry")
+
+            return cls.zip_prefix + cls.digest_records(
+                (info.filename, info.CRC, info.file_size)
+                for info in infos
+            )
+
+        except (zipfile.BadZipFile, EOFError, OSError, struct.error):
+            # Не zip или повреждённый (обрезанный) контейнер: как и в botix, отпечаток по содержимому
+            return cls.content_prefix + ArtifactsManifest.digest_file(path)
+
+    @staticmethod
+    def digest_records(records: Iterable[tuple[str, int, int]]) -> str:
+        """Хэш записей центрального каталога (имя, CRC-32, размер) в порядке каталога"""
+        h = hashlib.blake2b()
+
+        for name, crc, size in records:
+            h.update(f"{name}\0{crc:08x}\0{size}\n".encode("utf-8"))
+
+        return h.hexdigest()
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Сбросить отпечаток файла (или все отпечатки)"""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(path, None)
@@ -1,15 +1,26 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from itertools import chain
 from pathlib import Path
 import shutil
-from typing import Callable, Final, Optional
+import threading
+from typing import Callable, Final, Iterable, Mapping, Optional
+from typing import Collection
 from typing import Sequence
 
+from scaffold._archive import ReleaseArchiveWriter
+from scaffold._blobs import BlobStore
 from scaffold._logger import Logger
+from scaffold._manifest import ArtifactsManifest
+from scaffold._manifest import ManifestEntry
 from scaffold._models import AssemblyUnitModel
+from scaffold._models import EmbeddedPartModel
 from scaffold._models import Model
 from scaffold._models import PartModel
 from scaffold._project import Project
+from scaffold._snapshot import _extension_tails
 
 class Job:
 
@@ -42,8 +53,23 @@ class ModelInfoJob(Job):
         for model in chain(assembly_unit_model.parts.values(), assembly_unit_model.assembly_units.values()):
             self._display_model(model)
 
+        self._display_embedded_parts(assembly_unit_model.embedded_parts.values())
         self._log.pop()
 
+    def _display_embedded_parts(self, parts: Collection[EmbeddedPartModel]) -> None:
+        if len(parts) == 0:
+            return
+
+        self._log.info(f"Embedded parts ({len(parts)})")
+
+        self._log.push()
+
+        for part in parts:
+            self._log.info(f"{part.name} ({part.size} bytes)")
+
+        self._log.pop()
+        self._log.info("")
+
     def _display_list(self, label: str, paths: Sequence[Path]) -> None:
         items = len(paths)
 
@@ -61,11 +87,72 @@ class ModelInfoJob(Job):
         self._log.info("")
 
 
+@dataclass
+class ArtifactsReport:
+    """Отчёт о подготовке артефактов сборочной единицы"""
+
+    copied_files: int = 0
+    """Скопированные файлы"""
+
+    copied_bytes: int = 0
+    """Объём скопированных файлов"""
+
+    skipped_files: int = 0
+    """Неизменённые файлы, оставленные как есть"""
+
+    skipped_bytes: int = 0
+    """Объём неизменённых файлов"""
+
+    removed_files: int = 0
+    """Удалённые устаревшие файлы"""
+
+    linked_files: int = 0
+    """Файлы, созданные из хранилища содержимого без копирования"""
+
+    linked_bytes: int = 0
+    """Объём файлов, созданных из хранилища содержимого"""
+
+
 class MakeArtifactsJob(Job):
 
-    def __init__(self, project: Project):
+    readme_filename: Final = "README.md"
+    """Имя генерируемого файла описания"""
+
+    manifest_suffix: Final = ".manifest.json"
+    """Суффикс файла манифеста артефактов сборочной единицы"""
+
+    blobs_directory_name: Final = ".blobs"
+    """Имя директории хранилища содержимого в директории артефактов"""
+
+    def __init__(self, project: Project, incremental: bool = False, staging: bool = True, deduplicate: bool = False):
+        """
+        :param project: Проект
+        :param incremental: Сохранять неизменённые файлы артефактов (по манифесту) вместо полной пересборки
+        :param staging: Создавать директорию артефактов сборочной единицы (архив записывается напрямую из исходных файлов)
+        :param deduplicate: Хранить содержимое файлов артефактов один раз (по хэшу),
+        файлы сборочных единиц - жёсткие ссылки на него (хранилище очищается вызовом prune_blobs)
+        """
         super().__init__()
         self.project: Final = project
+        self.incremental: Final = incremental
+        self.staging: Final = staging
+        self._blobs: Final = BlobStore(project.config.artifacts_directory / self.blobs_directory_name) if deduplicate else None
+        self._current: Final = threading.local()
+        """Сборочная единица, обрабатываемая текущим потоком (для строк журнала)"""
+
+    def _print(self, message: str) -> None:
+        """Строка журнала с идентификатором обрабатываемой сборочной единицы (строки потоков не перемешиваются)"""
+        self._log.info(f"{getattr(self._current, 'identifier', '-')}: {message}")
+
+    def prune_blobs(self) -> tuple[int, int]:
+        """
+        Удалить из хранилища содержимое, на которое не ссылаются файлы артефактов
+        :return: Количество и суммарный размер удалённых файлов
+        """
+        if self._blobs is None:
+            return 0, 0
+
+        return self._blobs.prune()
 
     def _link(self, s: str, path: str) -> str:
         return f"[`{s}`]({path})"
@@ -151,68 +238,268 @@ class MakeArtifactsJob(Job):
     def _make_footer(self) -> str:
         return "\n\nФайл сгенерирован инструментами проекта [Botix](https://github.com/KiraFlux/Botix)\n"
 
-    def run(self, unit: AssemblyUnitModel) -> None:
-        if unit.export is None:
-            print("no export file")
-            return
-        
+    def _update_file(
+            self,
+            source: Path,
+            destination: Path,
+            previous: Optional[ManifestEntry],
+            report: ArtifactsReport
+    ) -> ManifestEntry:
+        stat = source.stat()
+
+        if previous is not None and destination.is_file() and destination.stat().st_size == previous.size:
+            if previous.matches(source, stat):
+                return self._skip_file(destination, previous, report)
+
+            if previous.size == stat.st_size and previous.digest == ArtifactsManifest.digest_file(source):
+                return self._skip_file(destination, ManifestEntry.from_stat(source, stat, previous.digest), report)
+
+        if self._blobs is None:
+            self._print(f"copy: {destination.name}")
+            destination.unlink(missing_ok=True)
+            digest = ArtifactsManifest.copy_file(source, destination)
+            report.copied_files += 1
+            report.copied_bytes += stat.st_size
+            return ManifestEntry.from_stat(source, stat, digest)
+
+        known_digest = previous.digest if previous is not None and previous.matches(source, stat) else None
+        digest, stored = self._blobs.put(source, known_digest)
+        self._blobs.link(digest, destination)
+
+        if stored:
+            self._print(f"copy: {destination.name}")
+            report.copied_files += 1
+            report.copied_bytes += stat.st_size
+        else:
+            self._print(f"link: {destination.name}")
+            report.linked_files += 1
+            report.linked_bytes += stat.st_size
+
+        return ManifestEntry.from_stat(source, stat, digest)
+
+    def _skip_file(self, destination: Path, entry: ManifestEntry, report: ArtifactsReport) -> ManifestEntry:
+        self._print(f"skip: {destination.name}")
+        report.skipped_files += 1
+        report.skipped_bytes += entry.size
+        return entry
+
+    def _collect_files(self, unit: AssemblyUnitModel) -> Sequence[tuple[Path, str]]:
+        """
+        Исходные файлы артефактов и их выходные имена.
+        Файлы, чьи имена совпали бы по последнему расширению (*.prusa.3mf и *.3mf), получают составное расширение
+        :raises ValueError: Выходные имена совпадают и с составным расширением
+        """
+        ret = list[tuple[Path, str]]()
+        compound_names = list[str]()
+
+        def _move(p: Optional[Path], name_transformer: Callable[[str], str] = str) -> None:
+            if p:
+                # Файлы моделей безымянные ('.stl', '.prusa.3mf'): расширение берётся из имени целиком
+                stem = name_transformer(p.parent.stem)
+                extensions = tuple(f".{e}" for e in _extension_tails(p.name)) or ("",)
+                ret.append((p, stem + extensions[-1]))
+                compound_names.append(stem + extensions[0])
+
+        def _resolve_part_by_key(key: str) -> Optional[PartModel]:
+            ret = self.project.get_part_model(key)
+
+            if ret is not None:
+                return ret
+            
+            return unit.parts.get(key)
+
+        for part_id, count in unit.export.items():
+            part = _resolve_part_by_key(part_id)
+
+            if part is None:
+                self._print(f"fail: {part_id}")
+                continue
+
+            def _name_transformer(s: str) -> str:
+                return f"{s}--{count}x--{unit.identifier}"
+
+            for transition in part.transitions:
+                _move(transition, _name_transformer)
+
+        counts = Counter(name for _, name in ret)
+
+        ret = [
+            (p, compound if counts[name] > 1 else name)
+            for (p, name), compound in zip(ret, compound_names)
+        ]
+
+        duplicates = sorted(name for name, count in Counter(name for _, name in ret).items() if count > 1)
+
+        if duplicates:
+            raise ValueError(f"{unit.identifier}: duplicate artifact names: {', '.join(duplicates)}")
+
+        return ret
+
+    def _stage(self, unit: AssemblyUnitModel, files: Sequence[tuple[Path, str]], readme: str) -> ArtifactsReport:
+        """Подготовить директорию артефактов сборочной единицы"""
         unit_artifacts_directory = self.project.config.artifacts_directory / unit.identifier
 
+        manifest_path = self.project.config.artifacts_directory / f"{unit.identifier}{self.manifest_suffix}"
+        previous = ArtifactsManifest.load(manifest_path) if self.incremental else ArtifactsManifest(manifest_path)
+        manifest = ArtifactsManifest(manifest_path)
+        report = ArtifactsReport()
+
         #
 
-        if unit_artifacts_directory.exists():
-            print("cleanup...")
+        if not self.incremental and unit_artifacts_directory.exists():
+            self._print("cleanup...")
             shutil.rmtree(unit_artifacts_directory)
 
         unit_artifacts_directory.mkdir(parents=True, exist_ok=True)
 
         #
 
-        def _move(p: Optional[Path], name_transformer: Callable[[str], str] = str) -> None:
-            if p:
-                dst = unit_artifacts_directory / (name_transformer(p.parent.stem) + p.suffix)
-                print(f"copy: {dst.name}")
-                shutil.copyfile(p, dst)
+        for source, name in files:
+            dst = unit_artifacts_directory / name
+            manifest.entries[name] = self._update_file(source, dst, previous.entries.get(name), report)
+
+        with open(unit_artifacts_directory / self.readme_filename, "wt", encoding="utf-8") as out:
+            out.write(readme)
+
+        for stale in unit_artifacts_directory.iterdir():
+            if stale.name != self.readme_filename and stale.name not in manifest.entries:
+                self._print(f"remove: {stale.name}")
+
+                if stale.is_dir():
+                    shutil.rmtree(stale)
+                else:
+                    stale.unlink()
+
+                report.removed_files += 1
+
+        manifest.save()
+        return report
+
+    def run(self, unit: AssemblyUnitModel) -> Optional[ArtifactsReport]:
+        self._current.identifier = unit.identifier
+
+        if unit.export is None:
+            self._print("no export file")
+            return None
 
         current_date = self._date()
+        files = self._collect_files(unit)
+        readme = self._make_header(unit, current_date) + self._make_footer()
 
-        def _resolve_part_by_key(key: str) -> Optional[PartModel]:
-            ret = self.project.get_part_model(key)
+        report = self._stage(unit, files, readme) if self.staging else ArtifactsReport()
 
-            if ret is not None:
-                return ret
-            
-            return unit.parts.get(key)
-            
+        archive_path = self.project.config.artifacts_directory / f"{unit.identifier}--{current_date}.zip"
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._print(f"{archive_path=}")
+        with ReleaseArchiveWriter(archive_path) as archive:
+            archive.write_text(self.readme_filename, readme)
+
+            for source, name in files:
+                archive.write_file(source, name)
 
-        with open(unit_artifacts_directory / "README.md", "wt", encoding="utf-8") as out:
-            out.write(self._make_header(unit, current_date))
+        self._print(f"{report=}")
+        self._print(f"All done! {unit.identifier}")
 
-            for part_id, count in unit.export.items():
-                part = _resolve_part_by_key(part_id)
+        return report
 
-                if part is None:
-                    print(f"fail: {part_id}")
-                    continue
 
-                def _name_transformer(s: str) -> str:
-                    return f"{s}--{count}x--{unit.identifier}"
+@dataclass(frozen=True, kw_only=True)
+class BatchArtifactsResult:
+    """Результат подготовки артефактов одной сборочной единицы в пакете"""
 
-                for transition in part.transitions:
-                    _move(transition, _name_transformer)
+    identifier: str
+    """Идентификатор сборочной единицы"""
 
-            out.write(self._make_footer())
+    report: Optional[ArtifactsReport] = None
+    """Отчёт о подготовке артефактов"""
 
+    error: Optional[BaseException] = None
+    """Ошибка подготовки"""
 
-        archive_path = self.project.config.artifacts_directory / f"{unit.identifier}--{current_date}"
+    @property
+    def succeeded(self) -> bool:
+        """Артефакты подготовлены"""
+        return self.error is None and self.report is not None
 
-        print(f"{archive_path=}")
-        shutil.make_archive(
-            base_name=str(archive_path),
-            format="zip",
-            root_dir=str(unit_artifacts_directory),
+
+class BatchArtifactsJob(Job):
+    """Подготовка артефактов множества сборочных единиц в пуле потоков"""
+
+    def __init__(self, job: MakeArtifactsJob, workers: int = 1):
+        """
+        :param job: Задача подготовки артефактов (её проект используется для всех сборочных единиц).
+        Для workers > 1 проект должен быть создан с thread_safe=True
+        :param workers: Количество потоков
+        :raises ValueError: workers > 1 для проекта без thread_safe
+        """
+        assert workers > 0
+
+        if workers > 1 and not job.project.thread_safe:
+            raise ValueError("BatchArtifactsJob with workers > 1 requires Project(thread_safe=True)")
+
+        super().__init__()
+        self.job: Final = job
+        self.workers: Final = workers
+
+    def find_exported_units(self) -> Sequence[str]:
+        """Идентификаторы всех сборочных единиц с файлом параметров экспорта"""
+        config = self.job.project.config
+        filename = f".{config.assembly_unit_model_export_settings_extension}"
+
+        return tuple(
+            path.parent.relative_to(config.models_directory).as_posix()
+            for path in config.search_by_masks_recursive(config.models_directory, (filename,))
         )
 
-        print(f"All done! {unit.identifier}")
+    def run(self, identifiers: Optional[Iterable[str]] = None) -> Mapping[str, BatchArtifactsResult]:
+        """
+        Подготовить артефакты сборочных единиц
+        :param identifiers: Идентификаторы сборочных единиц (None - все с файлом параметров экспорта)
+        :return: Результаты по идентификаторам (в порядке запроса)
+        """
+        identifiers = tuple(dict.fromkeys(self.find_exported_units() if identifiers is None else identifiers))
+
+        if self.workers == 1:
+            results = tuple(map(self._run_unit, identifiers))
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scaffold-release") as executor:
+                results = tuple(executor.map(self._run_unit, identifiers))
+
+        self._display_summary(results)
+
+        return {
+            result.identifier: result
+            for result in results
+        }
 
-        return
+    def _run_unit(self, identifier: str) -> BatchArtifactsResult:
+        try:
+            unit = self.job.project.get_assembly_unit_model(identifier)
+
+            if unit is None:
+                raise FileNotFoundError(f"Assembly unit not found: {identifier}")
+
+            report = self.job.run(unit)
+
+            if report is None:
+                raise ValueError(f"No export settings: {identifier}")
+
+            return BatchArtifactsResult(identifier=identifier, report=report)
+
+        except Exception as e:
+            return BatchArtifactsResult(identifier=identifier, error=e)
+
+    def _display_summary(self, results: Sequence[BatchArtifactsResult]) -> None:
+        succeeded = sum(result.succeeded for result in results)
+        self._log.info(f"Succeeded: {succeeded}/{len(results)}")
+
+        self._log.push()
+
+        for result in results:
+            if result.succeeded:
+                self._log.info(f"ok: {result.identifier} ({result.report.copied_bytes + result.report.linked_bytes + result.report.skipped_bytes} bytes)")
+            else:
+                self._log.error(f"fail: {result.identifier} ({result.error})")
+
+        self._log.pop()
@@ -0,0 +1,54 @@
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Final
+from typing import Iterable
+
+
+class ParallelLoader:
+    """
+    Пул потоков для параллельного создания соседних моделей.
+    Результаты возвращаются в порядке входных элементов
+    """
+
+    def __init__(self, workers: int) -> None:
+        """
+        :param workers: Количество рабочих потоков
+        """
+        assert workers > 0
+
+        self.workers: Final = workers
+        """Количество рабочих потоков"""
+
+        self._window: Final = workers * 2
+        self._executor: Final = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scaffold-loader")
+
+    def map[T, R](self, function: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """
+        Применить функцию к элементам в пуле потоков.
+        В очереди пула одновременно находится не более 2 * workers задач.
+        Задача, не начатая к моменту ожидания, выполняется вызывающим потоком -
+        поэтому вложенные вызовы (загрузка поддеревьев) не блокируют друг друга
+        """
+        ret = list[R]()
+        pending = deque[tuple[T, Future[R]]]()
+
+        def _complete_first() -> None:
+            item, future = pending.popleft()
+            ret.append(function(item) if future.cancel() else future.result())
+
+        for item in items:
+            pending.append((item, self._executor.submit(function, item)))
+
+            if len(pending) >= self._window:
+                _complete_first()
+
+        while pending:
+            _complete_first()
+
+        return ret
+
+    def shutdown(self) -> None:
+        """Остановить рабочие потоки"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+from typing import Mapping
+from typing import MutableMapping
+from typing import Optional
+
+
+@dataclass(frozen=True, kw_only=True)
+class ManifestEntry:
+    """Запись манифеста: источник выходного файла артефактов"""
+
+    source: str
+    """Путь к исходному файлу"""
+
+    size: int
+    """Размер исходного файла"""
+
+    mtime_ns: int
+    """Время изменения исходного файла"""
+
+    digest: str
+    """Хэш содержимого (BLAKE2b)"""
+
+    @classmethod
+    def from_stat(cls, source: Path, stat: os.stat_result, digest: str) -> ManifestEntry:
+        """Создать запись по результату stat исходного файла"""
+        return cls(source=str(source), size=stat.st_size, mtime_ns=stat.st_mtime_ns, digest=digest)
+
+    def matches(self, source: Path, stat: os.stat_result) -> bool:
+        """Исходный файл не изменился (по пути, размеру и времени изменения)"""
+        return self.source == str(source) and self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+
+class ArtifactsManifest:
+    """Манифест выходных файлов артефактов сборочной единицы"""
+
+    chunk_size: Final = 1 << 20
+    """Размер блока чтения при копировании и хэшировании"""
+
+    def __init__(self, path: Path, entries: Optional[Mapping[str, ManifestEntry]] = None) -> None:
+        """
+        :param path: Путь к файлу манифеста
+        :param entries: Записи по имени выходного файла
+        """
+        self.path: Final = path
+        """Путь к файлу манифеста"""
+
+        self.entries: Final[MutableMapping[str, ManifestEntry]] = dict(entries or {})
+        """Записи по имени выходного файла"""
+
+    @classmethod
+    def load(cls, path: Path) -> ArtifactsManifest:
+        """Загрузить манифест (пустой, если файл отсутствует или повреждён)"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+
+            return cls(path, {
+                name: ManifestEntry(**entry)
+                for name, entry in data.items()
+            })
+
+        except (FileNotFoundError, ValueError, TypeError):
+            return cls(path)
+
+    def save(self) -> None:
+        """Сохранить манифест"""
+        with open(self.path, "wt", encoding="utf-8") as f:
+            json.dump(
+                {name: asdict(entry) for name, entry in self.entries.items()},
+                f,
+                ensure_ascii=False,
+                indent=2
+            )
+
+    @classmethod
+    def digest_file(cls, path: Path) -> str:
+        """Вычислить хэш содержимого файла"""
+        h = hashlib.blake2b()
+
+        with open(path, "rb") as f:
+            while chunk := f.read(cls.chunk_size):
+                h.update(chunk)
+
+        return h.hexdigest()
+
+    @classmethod
+    def copy_file(cls, source: Path, destination: Path) -> str:
+        """Скопировать файл, вычисляя хэш содержимого за тот же проход"""
+        h = hashlib.blake2b()
+
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            while chunk := src.read(cls.chunk_size):
+                h.update(chunk)
+                dst.write(chunk)
+
+        return h.hexdigest()
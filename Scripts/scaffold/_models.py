@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-import json
+import zipfile
+from functools import cached_property
 from pathlib import Path
-from typing import Callable, Iterable, Mapping, Optional
+from typing import BinaryIO
+from typing import Callable, ItemsView, Iterator, Mapping, Optional, ValuesView
+from xml.etree import ElementTree
 from typing import Final
 from typing import Sequence
 
 from scaffold import Config
+from scaffold._loader import ParallelLoader
 
 
 class Model:
@@ -26,19 +30,29 @@ class Model:
         :param model_file_extension: Расширение файла модели
         """
 
-        path = content_directory / self._nameless_filename_from_extension(model_file_extension)
-        if not path.exists():
-            raise FileNotFoundError(f"Model not found: {path}")
+        filename = self._nameless_filename_from_extension(model_file_extension)
+        if not config.contains_file(content_directory, filename):
+            raise FileNotFoundError(f"Model not found: {content_directory / filename}")
 
         self.content_directory: Final = content_directory
         """Путь к директории файлов модели"""
 
+        self.model_file: Final = content_directory / filename
+        """Путь к файлу модели"""
+
         self.identifier: Final = config.get_identifier_from_dir(self.content_directory) 
         """Идентификатор модели"""
 
         self.renders: Final = self.__get_renders(config)
         """Пути к рендерам модели"""
 
+        self._config: Final = config
+
+    @property
+    def fingerprint(self) -> str:
+        """Отпечаток содержимого файла модели (по центральному каталогу zip-контейнера)"""
+        return self._config.fingerprints.get(self.model_file)
+
     @classmethod
     def _nameless_filename_from_extension(cls, extension: str) -> str:
         return f".{extension}"
@@ -47,11 +61,11 @@ class Model:
     def _mask_from_extension(cls, extension: str) -> str:
         return f"*{cls._nameless_filename_from_extension(extension)}"
 
-    def _apply_on_paths[T](self, config: Config, on_path: Callable[[Path], T], extension: str) -> Sequence[T]:
-        return tuple(map(
-            on_path,
-            config.iter_folders_contains_file_with_mask(self.content_directory, self._nameless_filename_from_extension(extension))
-        ))
+    def _find_children(self, config: Config, extension: str) -> Mapping[str, Path]:
+        return {
+            path.stem: path
+            for path in config.iter_folders_contains_file_with_mask(self.content_directory, self._nameless_filename_from_extension(extension))
+        }
 
     def _search_by_extensions(self, config: Config, extensions: Sequence[str]) -> Sequence[Path]:
         return tuple(config.search_by_masks(
@@ -78,44 +92,202 @@ class PartModel(Model):
         return self._search_by_extensions(config, config.part_model_transition_file_extensions)
 
 
+class LazyModelMapping[T: Model](Mapping[str, T]):
+    """
+    Отображение имя -> модель.
+    Модель создаётся при первом обращении по ключу и запоминается
+    """
+
+    def __init__(self, paths: Mapping[str, Path], factory: Callable[[Path], T], loader: Optional[ParallelLoader] = None) -> None:
+        """
+        :param paths: Пути к директориям моделей по именам
+        :param factory: Создаёт модель по пути к директории
+        :param loader: Пул для параллельного создания моделей при полной загрузке
+        """
+        self._paths: Final = paths
+        self._factory: Final = factory
+        self._loader: Final = loader
+        self._models: Final = dict[str, T]()
+
+    def load_all(self) -> None:
+        """Создать все ещё не созданные модели (параллельно, если задан пул)"""
+        keys = tuple(key for key in self._paths if key not in self._models)
+
+        if len(keys) == 0:
+            return
+
+        if self._loader is None or len(keys) == 1:
+            for key in keys:
+                self[key]
+
+            return
+
+        models = self._loader.map(self._factory, (self._paths[key] for key in keys))
+
+        for key, model in zip(keys, models):
+            self._models.setdefault(key, model)
+
+    def values(self) -> ValuesView[T]:
+        self.load_all()
+        return super().values()
+
+    def items(self) -> ItemsView[str, T]:
+        self.load_all()
+        return super().items()
+
+    def __getitem__(self, key: str) -> T:
+        ret = self._models.get(key)
+
+        if ret is None:
+            ret = self._models.setdefault(key, self._factory(self._paths[key]))
+
+        return ret
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._paths
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self._paths)})"
+
+
+class EmbeddedPartModel:
+    """
+    Описание локальной детали, хранящейся внутри файла модели сборочной единицы.
+    Создаётся по центральному каталогу архива, содержимое открывается только по запросу
+    """
+
+    def __init__(self, assembly_file: Path, entry: zipfile.ZipInfo, resource_hash: Optional[str]) -> None:
+        """
+        :param assembly_file: Путь к файлу модели сборочной единицы
+        :param entry: Запись архива с документом детали
+        :param resource_hash: Хэш ресурса из resourcesInfo
+        """
+        self.assembly_file: Final = assembly_file
+        """Путь к файлу модели сборочной единицы"""
+
+        self.entry_name: Final = entry.filename
+        """Имя записи архива ('details\\>Деталь (локальная) 1.m3d')"""
+
+        self.name: Final = Path(entry.filename.rpartition('>')[2]).stem
+        """Имя детали ('Деталь (локальная) 1')"""
+
+        self.size: Final = entry.file_size
+        """Размер документа детали"""
+
+        self.crc: Final = entry.CRC
+        """Контрольная сумма документа детали"""
+
+        self.resource_hash: Final = resource_hash
+        """Хэш ресурса (None - ресурс не описан)"""
+
+    def open(self) -> BinaryIO:
+        """Открыть документ детали как поток с произвольным доступом (без извлечения на диск)"""
+        with zipfile.ZipFile(self.assembly_file) as archive:
+            # Поток сохраняет файл архива открытым до своего закрытия
+            return archive.open(self.entry_name)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.assembly_file}, {self.entry_name!r})"
+
+
 class AssemblyUnitModel(Model):
     """
     Описание модели сборочной единицы
     """
 
-    def __init__(self, config: Config, content_directory: Path):
+    def __init__(self, config: Config, content_directory: Path, loader: Optional[ParallelLoader] = None):
+        """
+        :param config: Конфигурация проекта
+        :param content_directory: Путь к директории файлов модели
+        :param loader: Пул для параллельного создания вложенных моделей
+        """
         super().__init__(config, content_directory, config.assembly_unit_model_extension)
 
-        self.parts: Final[Mapping] = self.__load_parts(config)
+        if loader is not None:
+            loader.map(config.directory_index.get, config.directory_index.get(content_directory).folders)
+
+        self.parts: Final[LazyModelMapping[PartModel]] = LazyModelMapping(
+            self._find_children(config, config.part_model_extension),
+            lambda path: PartModel(config, path),
+            loader
+        )
         """Модели деталей"""
 
-        self.assembly_units: Final[Mapping] = self.__load_assembly_units(config)
+        self.assembly_units: Final[LazyModelMapping[AssemblyUnitModel]] = LazyModelMapping(
+            self._find_children(config, config.assembly_unit_model_extension),
+            lambda path: AssemblyUnitModel(config, path, loader),
+            loader
+        )
         """Модели сборочных единиц"""
 
-        self.export: Final = self.__load_export(config)
-        """Параметры экспорта артефактов"""
+    embedded_parts_prefix: Final = "details\\"
+    """Префикс записей локальных деталей в файле модели"""
 
-    def __load_parts(self, config: Config) -> Mapping[str, PartModel]:
-        parts = self._apply_on_paths(config, lambda path: PartModel(config, path), config.part_model_extension)
-        
-        return {
-            part.content_directory.stem : part
-            for part in parts
-        }
+    resources_entry: Final = "resourcesInfo"
+    """Запись с хэшами вложенных ресурсов"""
+
+    @cached_property
+    def embedded_parts(self) -> Mapping[str, EmbeddedPartModel]:
+        """
+        Локальные детали, хранящиеся в файле модели (по имени ресурса '>Деталь.m3d').
+        Имена деталей из разных подсборок могут совпадать ('A>X.m3d', 'B>X.m3d')
+        """
+        try:
+            with zipfile.ZipFile(self.model_file) as archive:
+                entries = [
+                    info
+                    for info in archive.infolist()
+                    if info.filename.startswith(self.embedded_parts_prefix) and info.file_size > 0
+                ]
+
+                if len(entries) == 0:
+                    return {}
+
+                hashes = self._read_resource_hashes(archive)
+
+        except zipfile.BadZipFile:
+            return {}
+
+        ret = dict[str, EmbeddedPartModel]()
+
+        for info in entries:
+            resource_name = info.filename[len(self.embedded_parts_prefix):]
+            ret[resource_name] = EmbeddedPartModel(self.model_file, info, hashes.get(resource_name))
+
+        return ret
+
+    @classmethod
+    def _read_resource_hashes(cls, archive: zipfile.ZipFile) -> Mapping[str, str]:
+        """
+        Хэши ресурсов по именам (пусто, если записи нет или она повреждена).
+        Повторяет ResourceInfo.parseAll из kompas.api: scaffold не зависит от Botix-Scripts
+        """
+        if cls.resources_entry not in archive.NameToInfo:
+            return {}
+
+        try:
+            root = ElementTree.fromstring(archive.read(cls.resources_entry))
+
+        except (ElementTree.ParseError, zipfile.BadZipFile):
+            return {}
 
-    def __load_assembly_units(self, config: Config) -> Mapping[str, AssemblyUnitModel]:
-        units = self._apply_on_paths(config, lambda path: AssemblyUnitModel(config, path), config.assembly_unit_model_extension)
-        
         return {
-            unit.content_directory.stem : unit
-            for unit in units
+            element.get("name", ""): element.get("hash", "")
+            for element in root.iter("resource")
         }
 
-    def __load_export(self, config: Config) -> Optional[Mapping[str, int]]:
-        p = self.content_directory / self._nameless_filename_from_extension(config.assembly_unit_model_export_settings_extension)
-        
-        if not p.exists():
+    @cached_property
+    def export(self) -> Optional[Mapping[str, int]]:
+        """Параметры экспорта артефактов"""
+        filename = self._nameless_filename_from_extension(self._config.assembly_unit_model_export_settings_extension)
+
+        if not self._config.contains_file(self.content_directory, filename):
             return None
 
-        with open(p) as f:
-            return json.load(f)
\ No newline at end of file
+        return self._config.directory_index.read_json(self.content_directory / filename)
@@ -1,11 +1,15 @@
+from __future__ import annotations
+
 from pathlib import Path
-from typing import Callable, Final, Optional
+from typing import Callable, Final, Mapping, Optional
 
 from scaffold._models import AssemblyUnitModel
 from scaffold._config import Config
+from scaffold._loader import ParallelLoader
 from scaffold._models import Model
 from scaffold._models import PartModel
 from scaffold._registry import Registry
+from scaffold._registry import RegistryStatistics
 
 
 class Project:
@@ -15,14 +19,31 @@ class Project:
     """
 
     @classmethod
-    def default(cls, root_directory: Path):
-        return cls(Config.default(root_directory))
-        
+    def default(cls, root_directory: Path, persistent_index: bool = False):
+        return cls(Config.default(root_directory, persistent_index))
+
+    def __init__(
+            self,
+            config: Config,
+            registry_max_size: Optional[int] = None,
+            thread_safe: bool = False,
+            workers: int = 1,
+    ) -> None:
+        """
+        :param config: Конфигурация проекта
+        :param registry_max_size: Максимальное количество моделей в каждом реестре (None - без ограничений)
+        :param thread_safe: Потокобезопасные реестры: одновременные запросы одной модели выполняют одну загрузку
+        :param workers: Количество потоков для параллельного создания вложенных моделей сборочных единиц
+        """
+        assert workers > 0
 
-    def __init__(self, config: Config) -> None:
-        """Конфигурация проекта"""
         self.config: Final = config
-        
+        """Конфигурация проекта"""
+
+        self.thread_safe: Final = thread_safe
+        """Реестры потокобезопасны (требуется для асинхронного и многопоточного доступа)"""
+
+        self._loader: Final = ParallelLoader(workers) if workers > 1 else None
 
         def _load_model[T: Model](identifier: str, provider: Callable[[Config, Path], T]) -> Optional[T]:
             p = config.content_path_from_identifier(identifier)
@@ -30,19 +51,76 @@ class Project:
             if p is None:
                 return None
 
-            return provider(config, p)
+            try:
+                return provider(config, p)
 
-        def _make_provider[T: Model](cls: type[T]) -> Callable[[str], Optional[T]]:
-            return lambda identifier: _load_model(identifier, lambda path, config: cls(path, config))
+            except FileNotFoundError:
+                return None
 
         self._part_model_registry: Final[Registry[PartModel]] = Registry(
-            item_provider=_make_provider(PartModel)
+            item_provider=lambda identifier: _load_model(identifier, PartModel),
+            max_size=registry_max_size,
+            thread_safe=thread_safe,
         )
 
         self._assembly_unit_model_registry: Final[Registry[AssemblyUnitModel]] = Registry(
-            item_provider=_make_provider(AssemblyUnitModel)
+            item_provider=lambda identifier: _load_model(
+                identifier,
+                lambda config, path: AssemblyUnitModel(config, path, self._loader)
+            ),
+            max_size=registry_max_size,
+            thread_safe=thread_safe,
         )
 
+    def close(self) -> None:
+        """Остановить рабочие потоки загрузки моделей и закрыть персистентный индекс"""
+        if self._loader is not None:
+            self._loader.shutdown()
+
+        self.config.close()
+
+    def __enter__(self) -> Project:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def registry_statistics(self) -> Mapping[str, RegistryStatistics]:
+        """Статистика обращений к реестрам моделей"""
+        return {
+            "parts": self._part_model_registry.statistics,
+            "assembly_units": self._assembly_unit_model_registry.statistics,
+        }
+
+    def invalidate(self, identifier: Optional[str] = None) -> None:
+        """
+        Сбросить закэшированные модели (и промахи) по идентификатору или полностью.
+        Вместе с моделью сбрасываются вложенные в неё модели и объемлющие сборочные единицы
+        (их отображения вложенных моделей хранят уже созданные модели), а также снимки директории модели,
+        её вложенных директорий и родительской директории.
+        Модели, уже полученные вызывающей стороной, не обновляются - их следует запросить заново
+        """
+        if identifier is None:
+            self._part_model_registry.invalidate()
+            self._assembly_unit_model_registry.invalidate()
+            self.config.directory_index.invalidate()
+            return
+
+        identifier = identifier.strip("/")
+        prefix = f"{identifier}/"
+
+        def _related(key: str) -> bool:
+            key = key.strip("/")
+            return key == identifier or key.startswith(prefix) or prefix.startswith(f"{key}/")
+
+        self._part_model_registry.invalidate_where(_related)
+        self._assembly_unit_model_registry.invalidate_where(_related)
+
+        p = self.config.models_directory.joinpath(identifier)
+        self.config.directory_index.invalidate(p, recursive=True)
+        self.config.directory_index.invalidate(p.parent)
+
     def get_part_model(self, identifier: str) -> Optional[PartModel]:
         """Получить описание модели детали по идентификатору"""
         return self._part_model_registry.get(identifier)
@@ -59,6 +137,23 @@ class Project:
             return model
 
         return self.get_assembly_unit_model(identifier)
+
+    async def get_part_model_async(self, identifier: str) -> Optional[PartModel]:
+        """Получить описание модели детали по идентификатору (asyncio, требует thread_safe=True)"""
+        return await self._part_model_registry.get_async(identifier)
+
+    async def get_assembly_unit_model_async(self, identifier: str) -> Optional[AssemblyUnitModel]:
+        """Получить описание сборочной единицы по идентификатору (asyncio, требует thread_safe=True)"""
+        return await self._assembly_unit_model_registry.get_async(identifier)
+
+    async def get_model_async(self, identifier: str) -> Optional[Model]:
+        """Получить описание модели по идентификатору (asyncio, требует thread_safe=True)"""
+        model = await self.get_part_model_async(identifier)
+
+        if model is not None:
+            return model
+
+        return await self.get_assembly_unit_model_async(identifier)
     
 
 
@@ -1,17 +1,71 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from threading import Lock
 from typing import Callable
 from typing import Final
 from typing import Optional
 
 
+@dataclass
+class RegistryStatistics:
+    """Статистика обращений к реестру"""
+
+    hits: int = 0
+    """Обращения, обслуженные из реестра (включая закэшированные промахи)"""
+
+    misses: int = 0
+    """Обращения, потребовавшие создания элемента"""
+
+    evictions: int = 0
+    """Вытесненные записи"""
+
+    coalesced: int = 0
+    """Обращения, дождавшиеся уже выполняющейся загрузки того же элемента"""
+
+
+class _Missing:
+    """Отметка отсутствующего элемента"""
+
+
 class Registry[T]:
     """Реестр"""
 
-    def __init__(self, item_provider: Callable[[str], Optional[T]]):
+    __missing: Final = _Missing()
+
+    def __init__(
+            self,
+            item_provider: Callable[[str], Optional[T]],
+            max_size: Optional[int] = None,
+            cache_misses: bool = True,
+            thread_safe: bool = False,
+    ):
         """
         :param item_provider: Создаёт элемент по идентификатору
+        :param max_size: Максимальное количество записей (None - без ограничений). Вытесняются давно не использованные
+        :param cache_misses: Запоминать отсутствие элемента до явного сброса
+        :param thread_safe: Потокобезопасный режим: одновременные запросы одного идентификатора
+        выполняют одну загрузку, остальные ожидают её результат
         """
-        self._items: Final = dict[str, T]()
+        assert max_size is None or max_size > 0
+
+        self._items: Final = OrderedDict[str, T | _Missing]()
         self._item_provider: Final = item_provider
+        self._max_size: Final = max_size
+        self._cache_misses: Final = cache_misses
+        self._lock: Final = Lock() if thread_safe else None
+        self._pending: Final = dict[str, Future[Optional[T]]]()
+        self._generation = 0
+        """Номер сброса: результат загрузки, начатой до сброса, не запоминается"""
+
+        self.statistics: Final = RegistryStatistics()
+        """Статистика обращений"""
+
+    @property
+    def thread_safe(self) -> bool:
+        """Реестр потокобезопасен"""
+        return self._lock is not None
 
     def get(self, identifier: str) -> Optional[T]:
         """
@@ -19,14 +73,147 @@ class Registry[T]:
         :param identifier: идентификатора
         :return:
         """
-        ret = self._items.get(identifier)
+        if self._lock is None:
+            found, ret = self._lookup(identifier)
+
+            if found:
+                return ret
+
+            self.statistics.misses += 1
+            generation = self._generation
+            ret = self._item_provider(identifier)
+
+            if generation == self._generation:
+                self._remember(identifier, ret)
 
-        if ret is not None:
             return ret
 
-        ret = self._item_provider(identifier)
+        with self._lock:
+            found, ret = self._lookup(identifier)
+
+            if found:
+                return ret
+
+            future = self._pending.get(identifier)
+            loading = future is None
+
+            if loading:
+                future = self._pending[identifier] = Future()
+                generation = self._generation
+                self.statistics.misses += 1
+            else:
+                self.statistics.coalesced += 1
+
+        if not loading:
+            return future.result()
 
-        if ret is not None:
-            self._items[identifier] = ret
+        try:
+            ret = self._item_provider(identifier)
 
+        except BaseException as e:
+            with self._lock:
+                self._release_pending(identifier, future)
+
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if generation == self._generation:
+                self._remember(identifier, ret)
+
+            self._release_pending(identifier, future)
+
+        future.set_result(ret)
         return ret
+
+    async def get_async(self, identifier: str) -> Optional[T]:
+        """
+        Получить значение из реестра, не блокируя цикл событий asyncio.
+        Загрузка выполняется в рабочем потоке, поэтому доступно только в потокобезопасном режиме
+        :raises RuntimeError: Реестр создан без thread_safe
+        """
+        if self._lock is None:
+            raise RuntimeError("Registry.get_async requires thread_safe=True")
+
+        return await asyncio.to_thread(self.get, identifier)
+
+    def invalidate(self, identifier: Optional[str] = None) -> None:
+        """
+        Сбросить запись (или все записи) реестра, включая закэшированные промахи
+        :param identifier: идентификатор
+        """
+        if self._lock is None:
+            self._invalidate(identifier)
+            return
+
+        with self._lock:
+            self._invalidate(identifier)
+
+    def invalidate_where(self, predicate: Callable[[str], bool]) -> None:
+        """
+        Сбросить записи реестра, идентификаторы которых удовлетворяют условию
+        :param predicate: Условие на идентификатор
+        """
+        if self._lock is None:
+            self._invalidate_where(predicate)
+            return
+
+        with self._lock:
+            self._invalidate_where(predicate)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _invalidate(self, identifier: Optional[str]) -> None:
+        self._generation += 1
+
+        if identifier is None:
+            self._items.clear()
+            self._pending.clear()
+        else:
+            self._items.pop(identifier, None)
+            self._pending.pop(identifier, None)
+
+    def _invalidate_where(self, predicate: Callable[[str], bool]) -> None:
+        self._generation += 1
+
+        for identifier in tuple(self._items):
+            if predicate(identifier):
+                del self._items[identifier]
+
+        for identifier in tuple(self._pending):
+            if predicate(identifier):
+                del self._pending[identifier]
+
+    def _release_pending(self, identifier: str, future: Future[Optional[T]]) -> None:
+        # Запись могла быть сброшена и занята новой загрузкой
+        if self._pending.get(identifier) is future:
+            del self._pending[identifier]
+
+    def _lookup(self, identifier: str) -> tuple[bool, Optional[T]]:
+        ret = self._items.get(identifier)
+
+        if ret is None:
+            return False, None
+
+        self._items.move_to_end(identifier)
+        self.statistics.hits += 1
+        return True, None if ret is self.__missing else ret
+
+    def _remember(self, identifier: str, item: Optional[T]) -> None:
+        if item is not None:
+            self._put(identifier, item)
+
+        elif self._cache_misses:
+            self._put(identifier, self.__missing)
+
+    def _put(self, identifier: str, item: T | _Missing) -> None:
+        self._items[identifier] = item
+        self._items.move_to_end(identifier)
+
+        if self._max_size is None:
+            return
+
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+            self.statistics.evictions += 1
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any
+from typing import Final
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+
+from scaffold._store import IndexStore
+
+
+def _has_magic(s: str) -> bool:
+    return any(c in s for c in "*?[")
+
+
+def _extension_tails(name: str) -> Iterator[str]:
+    """Все составные расширения имени файла: 'a.prusa.3mf' -> 'prusa.3mf', '3mf'"""
+    parts = name.split('.')
+
+    for i in range(1, len(parts)):
+        yield '.'.join(parts[i:])
+
+
+@dataclass(frozen=True, kw_only=True)
+class DirectorySnapshot:
+    """Снимок содержимого директории, полученный за один проход os.scandir"""
+
+    path: Path
+    """Путь к директории"""
+
+    folders: Sequence[Path]
+    """Вложенные директории (по типу DirEntry)"""
+
+    linked_folders: frozenset[Path]
+    """Вложенные директории, являющиеся символическими ссылками (при рекурсивном обходе не посещаются)"""
+
+    files: Mapping[str, Path]
+    """Файлы директории по имени (по типу DirEntry)"""
+
+    files_by_extension: Mapping[str, Sequence[Path]]
+    """Файлы директории, сгруппированные по (составному) расширению"""
+
+    @classmethod
+    def scan(cls, path: Path) -> DirectorySnapshot:
+        """Создать снимок директории"""
+        folders = list[str]()
+        linked_folders = list[str]()
+        files = list[str]()
+
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        folders.append(entry.name)
+
+                        if entry.is_symlink():
+                            linked_folders.append(entry.name)
+
+                    elif entry.is_file():
+                        files.append(entry.name)
+
+        except FileNotFoundError as e:
+            raise NotADirectoryError(path) from e
+
+        return cls.from_names(path, folders, files, linked_folders)
+
+    @classmethod
+    def from_names(
+            cls,
+            path: Path,
+            folders: Iterable[str],
+            files: Iterable[str],
+            linked_folders: Iterable[str] = (),
+    ) -> DirectorySnapshot:
+        """Создать снимок директории по именам вложенных директорий (и ссылок на директории среди них) и файлов"""
+        files_by_name = dict[str, Path]()
+        files_by_extension = dict[str, list[Path]]()
+
+        for name in files:
+            p = path / name
+            files_by_name[name] = p
+
+            for extension in _extension_tails(name):
+                files_by_extension.setdefault(extension, []).append(p)
+
+        return cls(
+            path=path,
+            folders=tuple(path / name for name in folders),
+            linked_folders=frozenset(path / name for name in linked_folders),
+            files=files_by_name,
+            files_by_extension={
+                extension: tuple(paths)
+                for extension, paths in files_by_extension.items()
+            },
+        )
+
+    def has_file(self, name: str) -> bool:
+        """Директория содержит файл с данным именем"""
+        return name in self.files
+
+    def match(self, mask: str) -> Sequence[Path]:
+        """Файлы директории, подходящие по glob маске"""
+        if not _has_magic(mask):
+            p = self.files.get(mask)
+            return () if p is None else (p,)
+
+        if mask.startswith("*.") and not _has_magic(extension := mask[2:]):
+            return self.files_by_extension.get(extension, ())
+
+        return tuple(
+            p
+            for name, p in self.files.items()
+            if fnmatchcase(name, mask)
+        )
+
+
+class DirectoryIndex:
+    """Кэш снимков директорий: каждая директория читается не более одного раза"""
+
+    def __init__(self, store: Optional[IndexStore] = None) -> None:
+        """
+        :param store: Персистентное хранилище снимков (проверяются по mtime директории)
+        """
+        self._snapshots: Final = dict[Path, DirectorySnapshot]()
+        self._documents: Final = dict[Path, Any]()
+        self._store: Final = store
+
+    def get(self, folder: Path) -> DirectorySnapshot:
+        """Получить снимок директории"""
+        ret = self._snapshots.get(folder)
+
+        if ret is None:
+            ret = self._snapshots.setdefault(folder, self._load(folder))
+
+        return ret
+
+    def read_json(self, path: Path) -> Any:
+        """Прочитать JSON документ"""
+        if path in self._documents:
+            return self._documents[path]
+
+        if self._store is None:
+            ret = self._read_json(path)
+
+        else:
+            mtime_ns = path.stat().st_mtime_ns
+            ret = self._store.load_document(path, mtime_ns)
+
+            if ret is None:
+                ret = self._read_json(path)
+                self._store.save_document(path, mtime_ns, ret)
+
+        return self._documents.setdefault(path, ret)
+
+    def walk(self, root_folder: Path) -> Iterator[DirectorySnapshot]:
+        """
+        Снимки директории и всех вложенных директорий (в прямом порядке).
+        Как и Path.rglob, не заходит в символические ссылки на директории - ссылка на предка не зацикливает обход
+        """
+        stack = [root_folder]
+
+        while stack:
+            snapshot = self.get(stack.pop())
+            yield snapshot
+            stack.extend(p for p in reversed(snapshot.folders) if p not in snapshot.linked_folders)
+
+        self.flush()
+
+    def invalidate(self, folder: Optional[Path] = None, recursive: bool = False) -> None:
+        """
+        Сбросить снимок директории (или все снимки)
+        :param folder: Директория (None - все снимки)
+        :param recursive: Сбросить также снимки всех вложенных директорий
+        """
+        if folder is None:
+            self._snapshots.clear()
+            self._documents.clear()
+            return
+
+        def _affected(p: Path) -> bool:
+            return p == folder or (recursive and p.is_relative_to(folder))
+
+        for p in tuple(self._snapshots):
+            if _affected(p):
+                del self._snapshots[p]
+
+        for path in tuple(self._documents):
+            if _affected(path.parent):
+                del self._documents[path]
+
+    def flush(self) -> None:
+        """Сохранить новые снимки в персистентное хранилище (одной транзакцией)"""
+        if self._store is not None:
+            self._store.flush()
+
+    def close(self) -> None:
+        """Закрыть персистентное хранилище снимков (снимки в памяти остаются доступны)"""
+        if self._store is not None:
+            self._store.close()
+
+    def _load(self, folder: Path) -> DirectorySnapshot:
+        if self._store is None:
+            return DirectorySnapshot.scan(folder)
+
+        try:
+            mtime_ns = folder.stat().st_mtime_ns
+
+        except FileNotFoundError as e:
+            raise NotADirectoryError(folder) from e
+
+        names = self._store.load_directory(folder, mtime_ns)
+
+        if names is not None:
+            return DirectorySnapshot.from_names(folder, *names)
+
+        ret = DirectorySnapshot.scan(folder)
+        self._store.save_directory(
+            folder,
+            mtime_ns,
+            [p.name for p in ret.folders],
+            list(ret.files),
+            [p.name for p in ret.linked_folders],
+        )
+        return ret
+
+    @staticmethod
+    def _read_json(path: Path) -> Any:
+        with open(path) as f:
+            return json.load(f)
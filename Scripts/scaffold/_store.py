@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from typing import Final
+from typing import Optional
+from typing import Sequence
+
+
+class IndexStore:
+    """
+    Персистентное хранилище индекса моделей (sqlite3).
+    Записи действительны, пока совпадает mtime директории (файла).
+    Используется журнал отката (WAL не поддерживается на сетевых файловых системах),
+    поэтому новые записи накапливаются и сохраняются одной транзакцией (flush, close)
+    """
+
+    default_filename: Final = ".scaffold-index.sqlite"
+    """Имя файла хранилища по умолчанию"""
+
+    max_pending: Final = 4096
+    """Количество накопленных записей, при котором они сохраняются без явного flush"""
+
+    __schema_version: Final = 2
+    """Версия схемы: хранилище с другой версией пересоздаётся"""
+
+    __schema: Final = (
+        """
+        CREATE TABLE IF NOT EXISTS directories (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            folders TEXT NOT NULL,
+            files TEXT NOT NULL,
+            linked_folders TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS documents (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            content TEXT NOT NULL
+        )
+        """,
+    )
+
+    def __init__(self, path: Path) -> None:
+        """
+        :param path: Путь к файлу хранилища
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path: Final = path
+        """Путь к файлу хранилища"""
+
+        self._lock: Final = Lock()
+        self._connection: Final = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=DELETE")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] != self.__schema_version:
+            self._connection.execute("DROP TABLE IF EXISTS directories")
+            self._connection.execute("DROP TABLE IF EXISTS documents")
+            self._connection.execute(f"PRAGMA user_version = {self.__schema_version}")
+
+        for statement in self.__schema:
+            self._connection.execute(statement)
+
+        self._pending_directories: Final = dict[str, tuple[int, str, str, str]]()
+        self._pending_documents: Final = dict[str, tuple[int, str]]()
+
+    @classmethod
+    def in_directory(cls, directory: Path) -> IndexStore:
+        """Хранилище с именем по умолчанию в данной директории"""
+        return cls(directory / cls.default_filename)
+
+    def load_directory(
+            self,
+            folder: Path,
+            mtime_ns: int
+    ) -> Optional[tuple[Sequence[str], Sequence[str], Sequence[str]]]:
+        """Получить имена (директорий, файлов, ссылок на директории) если запись действительна"""
+        with self._lock:
+            pending = self._pending_directories.get(str(folder))
+
+            if pending is not None:
+                row = pending[1:] if pending[0] == mtime_ns else None
+
+            else:
+                row = self._connection.execute(
+                    "SELECT folders, files, linked_folders FROM directories WHERE path = ? AND mtime_ns = ?",
+                    (str(folder), mtime_ns)
+                ).fetchone()
+
+        if row is None:
+            return None
+
+        folders, files, linked_folders = row
+        return json.loads(folders), json.loads(files), json.loads(linked_folders)
+
+    def save_directory(
+            self,
+            folder: Path,
+            mtime_ns: int,
+            folders: Sequence[str],
+            files: Sequence[str],
+            linked_folders: Sequence[str] = (),
+    ) -> None:
+        """Сохранить имена (директорий, файлов, ссылок на директории) - запись откладывается до flush"""
+        with self._lock:
+            self._pending_directories[str(folder)] = (
+                mtime_ns,
+                json.dumps(folders, ensure_ascii=False),
+                json.dumps(files, ensure_ascii=False),
+                json.dumps(list(linked_folders), ensure_ascii=False),
+            )
+            self._flush_if_full()
+
+    def load_document(self, path: Path, mtime_ns: int) -> Optional[Any]:
+        """Получить разобранный JSON документ если запись действительна"""
+        with self._lock:
+            pending = self._pending_documents.get(str(path))
+
+            if pending is not None:
+                row = pending[1:] if pending[0] == mtime_ns else None
+
+            else:
+                row = self._connection.execute(
+                    "SELECT content FROM documents WHERE path = ? AND mtime_ns = ?",
+                    (str(path), mtime_ns)
+                ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+
+    def save_document(self, path: Path, mtime_ns: int, content: Any) -> None:
+        """Сохранить разобранный JSON документ - запись откладывается до flush"""
+        with self._lock:
+            self._pending_documents[str(path)] = (mtime_ns, json.dumps(content, ensure_ascii=False))
+            self._flush_if_full()
+
+    def flush(self) -> None:
+        """Сохранить накопленные записи одной транзакцией"""
+        with self._lock:
+            self._flush()
+
+    def clear(self) -> None:
+        """Удалить все записи"""
+        with self._lock:
+            self._pending_directories.clear()
+            self._pending_documents.clear()
+            self._connection.execute("DELETE FROM directories")
+            self._connection.execute("DELETE FROM documents")
+
+    def close(self) -> None:
+        """Сохранить накопленные записи и закрыть хранилище"""
+        with self._lock:
+            self._flush()
+            self._connection.close()
+
+    def _flush_if_full(self) -> None:
+        if len(self._pending_directories) + len(self._pending_documents) >= self.max_pending:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending_directories and not self._pending_documents:
+            return
+
+        self._connection.execute("BEGIN")
+
+        try:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO directories (path, mtime_ns, folders, files, linked_folders) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ((path, *row) for path, row in self._pending_directories.items())
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO documents (path, mtime_ns, content) VALUES (?, ?, ?)",
+                ((path, *row) for path, row in self._pending_documents.items())
+            )
+
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+
+        self._connection.execute("COMMIT")
+        self._pending_directories.clear()
+        self._pending_documents.clear()
+
+    def __enter__(self) -> IndexStore:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
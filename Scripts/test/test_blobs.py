@@ -0,0 +1,52 @@
+import tempfile
+from pathlib import Path
+
+from scaffold import BlobStore
+
+root = Path(tempfile.mkdtemp())
+store = BlobStore(root / ".blobs")
+
+(root / "a.stl").write_bytes(b"solid shared")
+(root / "b.stl").write_bytes(b"solid shared")
+(root / "c.stl").write_bytes(b"solid other")
+
+# Одинаковое содержимое записывается один раз
+
+digest_a, stored_a = store.put(root / "a.stl")
+digest_b, stored_b = store.put(root / "b.stl")
+digest_c, stored_c = store.put(root / "c.stl")
+
+assert digest_a == digest_b != digest_c
+assert (stored_a, stored_b, stored_c) == (True, False, True)
+assert store.put(root / "a.stl", digest_a) == (digest_a, False)
+assert sorted(p.name for p in store.root.glob("*/*")) == sorted((digest_a, digest_c))
+print(f"put: {digest_a[:16]}, {digest_c[:16]}")
+
+# Выходные файлы - жёсткие ссылки на содержимое хранилища
+
+out = root / "out"
+out.mkdir()
+store.link(digest_a, out / "a.stl")
+store.link(digest_b, out / "b.stl")
+
+assert (out / "a.stl").read_bytes() == b"solid shared"
+assert (out / "a.stl").stat().st_ino == store.path_for(digest_a).stat().st_ino
+assert store.path_for(digest_a).stat().st_nlink == 3
+
+store.link(digest_c, out / "a.stl")
+assert (out / "a.stl").read_bytes() == b"solid other"
+print(f"link: {sorted(p.name for p in out.iterdir())}")
+
+# Очистка удаляет содержимое без ссылок и временные файлы
+
+(store.root / ".orphan.tmp").write_bytes(b"partial")
+(out / "b.stl").unlink()
+
+assert store.prune() == (2, len(b"solid shared") + len(b"partial"))
+assert not store.path_for(digest_a).exists()
+assert store.path_for(digest_c).is_file()
+assert store.prune() == (0, 0)
+
+digest, stored = store.put(root / "a.stl")
+assert (digest, stored) == (digest_a, True)
+print("prune: ok")
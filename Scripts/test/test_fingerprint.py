@@ -0,0 +1,34 @@
+# Отпечатки scaffold и botix должны совпадать: требуется Botix-Scripts/src в PYTHONPATH
+import tempfile
+from pathlib import Path
+
+from botix.impl.fingerprints import FingerprintService as BotixFingerprintService
+from scaffold import FingerprintService
+
+models = Path(__file__).resolve().parents[2] / "Models"
+files = sorted(p for p in models.rglob("*") if p.is_file())
+
+# Повреждённые файлы: отпечаток по содержимому в обоих пакетах
+
+damaged = Path(tempfile.mkdtemp())
+assembly = next(p for p in files if p.suffix == ".a3d" or p.name == ".a3d")
+data = assembly.read_bytes()
+
+(damaged / "truncated.a3d").write_bytes(data[:len(data) // 2])
+(damaged / "no-directory.a3d").write_bytes(data[:-30])
+(damaged / "empty.m3d").write_bytes(b"")
+(damaged / "text.stp").write_text("ISO-10303-21;")
+
+scaffold = FingerprintService()
+botix = BotixFingerprintService()
+
+for path in (*files, *damaged.iterdir()):
+    expected = botix.get(path)
+    actual = scaffold.get(path)
+    assert actual == expected, f"{path}: {actual} != {expected}"
+
+for path in damaged.iterdir():
+    assert scaffold.get(path).startswith(FingerprintService.content_prefix), path
+
+assert scaffold.get(assembly).startswith(FingerprintService.zip_prefix)
+print(f"fingerprints: {len(files)} models, {len(tuple(damaged.iterdir()))} damaged files match")
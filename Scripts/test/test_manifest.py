@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from scaffold import ArtifactsManifest
+from scaffold import MakeArtifactsJob
+from scaffold import Project
+
+root = Path(tempfile.mkdtemp())
+unit = root / "Models" / "U"
+
+for part_id in ("P1", "P2"):
+    part = unit / part_id
+    part.mkdir(parents=True)
+    (part / ".m3d").touch()
+    (part / ".stl").write_text(f"solid {part_id}")
+
+(unit / ".a3d").touch()
+(unit / ".export").write_text(json.dumps({"P1": 1, "P2": 3}))
+
+project = Project.default(root)
+model = project.get_assembly_unit_model("U")
+artifacts = project.config.artifacts_directory / "U"
+
+# Первый запуск копирует всё
+
+first = MakeArtifactsJob(project, incremental=True).run(model)
+assert (first.copied_files, first.skipped_files) == (2, 0), first
+
+manifest = ArtifactsManifest.load(project.config.artifacts_directory / f"U{MakeArtifactsJob.manifest_suffix}")
+assert sorted(manifest.entries) == ["P1--1x--U.stl", "P2--3x--U.stl"], manifest.entries
+print(f"first: {first}")
+
+# Неизменённые файлы пропускаются
+
+second = MakeArtifactsJob(project, incremental=True).run(model)
+assert (second.copied_files, second.skipped_files) == (0, 2), second
+print(f"second: {second}")
+
+# Изменённый файл копируется заново, файл с прежним содержимым и новым временем - нет
+
+(unit / "P1" / ".stl").write_text("solid P1 changed")
+stat = (unit / "P2" / ".stl").stat()
+os.utime(unit / "P2" / ".stl", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+third = MakeArtifactsJob(project, incremental=True).run(model)
+assert (third.copied_files, third.skipped_files) == (1, 1), third
+assert (artifacts / "P1--1x--U.stl").read_text() == "solid P1 changed"
+print(f"third: {third}")
+
+# Файл, удалённый из спецификации экспорта, удаляется из артефактов
+
+(unit / ".export").write_text(json.dumps({"P1": 1}))
+project = Project.default(root)
+
+fourth = MakeArtifactsJob(project, incremental=True).run(project.get_assembly_unit_model("U"))
+assert (fourth.skipped_files, fourth.removed_files) == (1, 1), fourth
+assert sorted(p.name for p in artifacts.iterdir()) == ["P1--1x--U.stl", "README.md"]
+print(f"fourth: {fourth}")
@@ -0,0 +1,46 @@
+import tempfile
+import zipfile
+from pathlib import Path
+
+from scaffold import ModelInfoJob
+from scaffold import Project
+
+root = Path(tempfile.mkdtemp())
+unit = root / "Models" / "U"
+unit.mkdir(parents=True)
+
+resources = '<?xml version="1.0"?>\n<resources>\n\t<resource name="A>X.m3d" hash="AA" type="detail" />\n</resources>'
+
+with zipfile.ZipFile(unit / ".a3d", "w") as z:
+    z.writestr("details\\A>X.m3d", b"part A")
+    z.writestr("details\\B>X.m3d", b"part B")
+    z.writestr("resourcesInfo", resources.encode("utf-16"))
+
+project = Project.default(root)
+model = project.get_assembly_unit_model("U")
+
+# Одноимённые детали разных подсборок не совпадают
+
+parts = model.embedded_parts
+
+assert sorted(parts) == ["A>X.m3d", "B>X.m3d"], sorted(parts)
+assert [p.name for p in parts.values()] == ["X", "X"]
+assert (parts["A>X.m3d"].resource_hash, parts["B>X.m3d"].resource_hash) == ("AA", None)
+
+with parts["B>X.m3d"].open() as f:
+    assert f.read() == b"part B"
+
+print(f"embedded parts: {parts}")
+
+# Повреждённая запись resourcesInfo не мешает перечислению деталей
+
+with zipfile.ZipFile(unit / ".a3d", "w") as z:
+    z.writestr("details\\A>X.m3d", b"part A")
+    z.writestr("resourcesInfo", b"<resources><resource")
+
+project = Project.default(root)
+model = project.get_assembly_unit_model("U")
+
+assert [(name, p.resource_hash) for name, p in model.embedded_parts.items()] == [("A>X.m3d", None)]
+ModelInfoJob().display(model)
+print("damaged resourcesInfo: ok")
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+from scaffold import Registry
+
+# LRU-вытеснение и статистика
+
+loaded = list[str]()
+
+
+def _provide(identifier: str):
+    loaded.append(identifier)
+    return None if identifier.startswith("missing") else identifier.upper()
+
+
+registry = Registry(_provide, max_size=2)
+
+assert registry.get("a") == "A"
+assert registry.get("b") == "B"
+assert registry.get("a") == "A"
+assert registry.get("c") == "C"
+assert len(registry) == 2
+
+assert registry.get("b") == "B"
+assert loaded == ["a", "b", "c", "b"], loaded
+
+assert registry.get("missing") is None
+assert registry.get("missing") is None
+assert loaded.count("missing") == 1
+
+statistics = registry.statistics
+assert (statistics.hits, statistics.misses, statistics.evictions) == (2, 5, 3), statistics
+print(f"lru: {statistics}")
+
+registry.invalidate("missing")
+registry.get("missing")
+assert loaded.count("missing") == 2
+
+# Объединение одновременных загрузок
+
+calls = 0
+release = threading.Event()
+
+
+def _slow(identifier: str) -> str:
+    global calls
+    calls += 1
+    release.wait()
+    return identifier
+
+
+registry = Registry(_slow, thread_safe=True)
+results = list[str]()
+threads = [threading.Thread(target=lambda: results.append(registry.get("x"))) for _ in range(8)]
+
+for t in threads:
+    t.start()
+
+while registry.statistics.coalesced < len(threads) - 1:
+    time.sleep(0.001)
+
+release.set()
+
+for t in threads:
+    t.join()
+
+assert calls == 1 and results == ["x"] * len(threads)
+assert registry.statistics.coalesced == len(threads) - 1
+print(f"single-flight: {registry.statistics}")
+
+# Результат загрузки, завершившейся после сброса, не запоминается
+
+started = threading.Event()
+release = threading.Event()
+versions = iter(("old", "new"))
+
+
+def _versioned(identifier: str) -> str:
+    started.set()
+    release.wait()
+    return next(versions)
+
+
+registry = Registry(_versioned, thread_safe=True)
+loader = threading.Thread(target=registry.get, args=("x",))
+loader.start()
+started.wait()
+registry.invalidate("x")
+release.set()
+loader.join()
+
+assert registry.get("x") == "new"
+print("invalidate during load: ok")
+
+# Асинхронный доступ только в потокобезопасном режиме
+
+assert asyncio.run(Registry(str.upper, thread_safe=True).get_async("a")) == "A"
+
+try:
+    asyncio.run(Registry(str.upper).get_async("a"))
+    raise AssertionError("get_async without thread_safe")
+
+except RuntimeError as e:
+    print(f"get_async: {e}")
@@ -0,0 +1,62 @@
+import json
+import tempfile
+import zipfile
+from pathlib import Path
+
+from scaffold import MakeArtifactsJob
+from scaffold import Project
+from scaffold import ReleaseArchiveWriter
+
+root = Path(tempfile.mkdtemp())
+
+# Сжатие записей и повторяющиеся имена
+
+(root / "a.stl").write_bytes(b"solid " * 1000)
+(root / "a.3mf").write_bytes(b"PK" * 1000)
+
+with ReleaseArchiveWriter(root / "archive.zip") as archive:
+    archive.write_text("README.md", "# readme")
+    archive.write_file(root / "a.stl", "a.stl")
+    archive.write_file(root / "a.3mf", "a.3mf")
+
+    try:
+        archive.write_file(root / "a.stl", "a.stl")
+        raise AssertionError("duplicate entry accepted")
+
+    except ValueError as e:
+        print(f"duplicate: {e}")
+
+with zipfile.ZipFile(root / "archive.zip") as z:
+    methods = {info.filename: info.compress_type for info in z.infolist()}
+
+assert methods == {
+    "README.md": zipfile.ZIP_DEFLATED,
+    "a.stl": zipfile.ZIP_DEFLATED,
+    "a.3mf": zipfile.ZIP_STORED,
+}, methods
+print(f"methods: {methods}")
+
+# Безымянные файлы обменных форматов детали
+
+unit = root / "Models" / "U"
+part = unit / "P1"
+part.mkdir(parents=True)
+(unit / ".a3d").touch()
+(unit / ".export").write_text(json.dumps({"P1": 2}))
+(part / ".m3d").touch()
+
+for name in (".stl", ".3mf", ".prusa.3mf"):
+    (part / name).write_text(name)
+
+project = Project.default(root)
+MakeArtifactsJob(project, staging=False).run(project.get_assembly_unit_model("U"))
+
+archive_path, = (root / "Artifacts").glob("U--*.zip")
+
+with zipfile.ZipFile(archive_path) as z:
+    names = sorted(z.namelist())
+    contents = {name: z.read(name).decode() for name in names if name != "README.md"}
+
+assert names == ["P1--2x--U.3mf", "P1--2x--U.prusa.3mf", "P1--2x--U.stl", "README.md"], names
+assert contents == {"P1--2x--U.3mf": ".3mf", "P1--2x--U.prusa.3mf": ".prusa.3mf", "P1--2x--U.stl": ".stl"}, contents
+print(f"names: {names}")